@@ -0,0 +1,54 @@
+# bench_engines.py
+#
+# Native sklearn pipeline vs onnxruntime for the same model, per batch size,
+# plus the largest probability difference between the two.
+
+import os
+import statistics
+import time
+
+import joblib
+import numpy as np
+
+import onnx_engine
+from benchmarks.inputs import MODELS, MODEL_FILES, sample_frame
+from preprocessing_utils import clean_categories
+
+
+def _median_time(fn, repeat):
+    fn()  # warm-up
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def bench_engines(batch_sizes=(1, 100, 10000), repeat=5, seed=0, threads=(1,)):
+    results = {}
+    for wrapper_name, columns in MODELS.items():
+        pkl_path = MODEL_FILES[wrapper_name]
+        onnx_path = pkl_path.replace(".pkl", ".onnx")
+        if not (os.path.exists(pkl_path) and os.path.exists(onnx_path)):
+            continue
+        native = joblib.load(pkl_path)
+        engines = {"sklearn": native}
+        for n_threads in threads:
+            engines[f"onnx_{n_threads}t"] = onnx_engine.OnnxModel(onnx_path, intra_op_threads=n_threads)
+
+        per_size = {}
+        for n_rows in batch_sizes:
+            df = clean_categories(sample_frame(native, columns, n_rows, seed))
+            expected = native.predict_proba(df)[:, 1]
+            entry = {}
+            for engine_name, model in engines.items():
+                median = _median_time(lambda: model.predict_proba(df), repeat)
+                entry[engine_name] = {
+                    "median_s": median,
+                    "rows_per_s": n_rows / median if median else None,
+                    "max_abs_diff": float(np.abs(model.predict_proba(df)[:, 1] - expected).max()),
+                }
+            per_size[str(n_rows)] = entry
+        results[wrapper_name] = per_size
+    return results
@@ -0,0 +1,60 @@
+# bench_explain.py
+#
+# Latency of the /explain path attributions per row, uncached and cached, per
+# batch size, checked against a per-row target. Also reports how far
+# base_value + sum(contributions) strays from the pipeline's own probability.
+
+import os
+import statistics
+import time
+
+import joblib
+import numpy as np
+
+import explain
+from benchmarks.inputs import MODELS, MODEL_FILES, sample_frame
+from preprocessing_utils import clean_categories
+
+
+TARGET_MS_PER_ROW = 5.0
+
+
+def _median_time(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def bench_explain(batch_sizes=(1, 100, 1000), repeat=5, seed=0, target_ms=TARGET_MS_PER_ROW):
+    results = {}
+    for wrapper_name, columns in MODELS.items():
+        pkl_path = MODEL_FILES[wrapper_name]
+        if not os.path.exists(pkl_path):
+            continue
+        model = joblib.load(pkl_path)
+        explainer = explain.ForestExplainer(model)
+
+        per_size = {}
+        for n_rows in batch_sizes:
+            df = clean_categories(sample_frame(model, columns, n_rows, seed))
+
+            def uncached():
+                explainer._cache.clear()
+                return explainer.explain(df)
+
+            rows = uncached()
+            totals = np.array([row["base_value"] + sum(row["contributions"].values()) for row in rows])
+            uncached_s = _median_time(uncached, repeat)
+            cached_s = _median_time(lambda: explainer.explain(df), repeat)
+            per_size[str(n_rows)] = {
+                "median_s": uncached_s,
+                "ms_per_row": uncached_s * 1000 / n_rows,
+                "cached_ms_per_row": cached_s * 1000 / n_rows,
+                "max_additivity_error": float(np.abs(totals - model.predict_proba(df)[:, 1]).max()),
+                "within_target": uncached_s * 1000 / n_rows <= target_ms,
+            }
+        results[wrapper_name] = per_size
+    return results
@@ -0,0 +1,150 @@
+# bench_models.py
+#
+# In-process micro-benchmarks: wrapper and batched pipeline latency per model,
+# model (un)pickling time, and cold start of the whole API module, plus
+# server start -> first successful prediction for each STARTUP_MODE.
+
+import gc
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+import joblib
+
+from preprocessing_utils import clean_categories
+from benchmarks import load_test
+from benchmarks.inputs import MODELS, MODEL_FILES, sample_frame, sample_rows, sampling_model
+
+
+BATCH_SIZES = (1, 10, 100, 1000, 10000)
+
+# Calling the single-row wrapper in a loop is slow, so only do it for small batches
+WRAPPER_MAX_ROWS = 100
+
+
+def _timeit(fn, repeat):
+    fn()  # warm-up
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _summary(times, n_rows):
+    median = statistics.median(times)
+    return {
+        "median_s": median,
+        "min_s": min(times),
+        "per_row_s": median / n_rows,
+        "rows_per_s": n_rows / median if median else None,
+        "repeat": len(times),
+    }
+
+
+def bench_wrappers(main, batch_sizes=BATCH_SIZES, repeat=5, seed=0):
+    results = {}
+    for wrapper_name, columns in MODELS.items():
+        wrapper, get_model = main.WRAPPERS[wrapper_name]
+        model = get_model()
+        domain = sampling_model(wrapper_name, model)
+        per_size = {}
+        for n_rows in batch_sizes:
+            df = sample_frame(domain, columns, n_rows, seed)
+            entry = {
+                # Same steps as the wrapper, but one predict_proba call for the whole batch
+                "batch": _summary(_timeit(lambda: model.predict_proba(clean_categories(df.copy()))[:, 1], repeat), n_rows),
+            }
+            if n_rows <= WRAPPER_MAX_ROWS:
+                rows = sample_rows(domain, columns, n_rows, seed)
+                entry["wrapper_loop"] = _summary(_timeit(lambda: [wrapper(*row) for row in rows], repeat), n_rows)
+            per_size[str(n_rows)] = entry
+        results[wrapper_name] = per_size
+    return results
+
+
+def bench_model_load(repeat=3):
+    results = {}
+    for wrapper_name, path in MODEL_FILES.items():
+        if not os.path.exists(path):
+            continue
+        times = []
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            joblib.load(path)
+            times.append(time.perf_counter() - start)
+        results[wrapper_name] = {"median_s": statistics.median(times), "min_s": min(times), "repeat": repeat}
+    return results
+
+
+# Fresh interpreter per run: total process time and time spent importing main (models included)
+def bench_cold_start(repeat=3):
+    code = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+    process_times, import_times = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        process_times.append(time.perf_counter() - start)
+        import_times.append(float(out.stdout.strip().splitlines()[-1]))
+    return {
+        "process_median_s": statistics.median(process_times),
+        "import_main_median_s": statistics.median(import_times),
+        "repeat": repeat,
+    }
+
+
+def _poll(fn, timeout):
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            if fn():
+                return
+        # Not listening yet, or answering with something other than JSON (a proxy page)
+        except (urllib.error.URLError, ConnectionError, OSError, ValueError):
+            pass
+        time.sleep(0.01)
+    raise TimeoutError(f"not ready within {timeout}s")
+
+
+def _status(url, body=None):
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    req = urllib.request.Request(url, data=body, headers=headers, method="POST" if body is not None else "GET")
+    try:
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            return resp.status, resp.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+# Fresh uvicorn process per run, timed from spawn: first HTTP answer on /health,
+# /health reporting "ok", and the first 200 from a prediction route
+def bench_startup(route, payload, modes=("eager", "background"), repeat=3, timeout=120.0):
+    body = json.dumps(payload).encode()
+    results = {}
+    for mode in modes:
+        runs = {"listening_s": [], "healthy_s": [], "first_prediction_s": []}
+        for _ in range(repeat):
+            port = load_test.free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            start = time.perf_counter()
+            server = load_test.start_server(port, env={"STARTUP_MODE": mode})
+            try:
+                _poll(lambda: _status(base_url + "/health")[0] in (200, 503), timeout)
+                runs["listening_s"].append(time.perf_counter() - start)
+                _poll(lambda: json.loads(_status(base_url + "/health")[1]).get("status") == "ok", timeout)
+                runs["healthy_s"].append(time.perf_counter() - start)
+                _poll(lambda: _status(base_url + route, body)[0] == 200, timeout)
+                runs["first_prediction_s"].append(time.perf_counter() - start)
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+        results[mode] = {f"{name.rsplit('_s', 1)[0]}_median_s": statistics.median(times) for name, times in runs.items()}
+        results[mode]["repeat"] = repeat
+    return results
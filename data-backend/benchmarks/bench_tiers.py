@@ -0,0 +1,74 @@
+# bench_tiers.py
+#
+# Accurate (RandomForest) vs fast tier, side by side per task: prediction latency,
+# memory held by the unpickled model and, when labelled rows are supplied,
+# Brier score and log-loss. Pass held-out rows only, otherwise the forest
+# (which has memorised its training rows) looks better than it is.
+
+import gc
+import os
+import statistics
+import time
+import tracemalloc
+
+import joblib
+import pandas as pd
+from sklearn.metrics import brier_score_loss, log_loss
+
+from benchmarks.inputs import MODELS, MODEL_FILES, FAST_MODEL_FILES, TARGETS, sample_frame
+
+
+# numpy reports its array allocations to tracemalloc, so this captures the tree arrays too
+def load_with_memory(path):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        model = joblib.load(path)
+        resident, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return model, {"resident_bytes": resident, "load_peak_bytes": peak, "file_bytes": os.path.getsize(path)}
+
+
+def latency(model, df, repeat):
+    model.predict_proba(df)  # warm-up
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        model.predict_proba(df)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def quality(model, X, y):
+    proba = model.predict_proba(X)[:, 1]
+    return {"brier": float(brier_score_loss(y, proba)), "log_loss": float(log_loss(y, proba, labels=[0, 1]))}
+
+
+def compare_tiers(wrapper_name, eval_frame=None, repeat=20, seed=0, paths=None):
+    columns = MODELS[wrapper_name]
+    paths = paths or {"accurate": MODEL_FILES[wrapper_name], "fast": FAST_MODEL_FILES[wrapper_name]}
+    results = {}
+    for tier, path in paths.items():
+        if not os.path.exists(path):
+            continue
+        model, memory = load_with_memory(path)
+        entry = {
+            "file": path,
+            **memory,
+            "latency_1_s": latency(model, sample_frame(model, columns, 1, seed), repeat),
+            "latency_1000_s": latency(model, sample_frame(model, columns, 1000, seed), max(3, repeat // 4)),
+        }
+        if eval_frame is not None:
+            entry.update(quality(model, eval_frame[columns], eval_frame[TARGETS[wrapper_name]]))
+        results[tier] = entry
+    return results
+
+
+# eval_data: {wrapper name: path to a CSV of held-out rows with the feature and label columns}
+def bench_tiers(eval_data=None, repeat=20):
+    eval_data = eval_data or {}
+    return {
+        wrapper_name: compare_tiers(wrapper_name, pd.read_csv(eval_data[wrapper_name]) if wrapper_name in eval_data else None, repeat)
+        for wrapper_name in MODELS
+    }
@@ -0,0 +1,87 @@
+# inputs.py
+#
+# Reproducible synthetic inputs for the prediction models. Values are drawn
+# from what each fitted pipeline already knows: the OneHotEncoder categories and
+# the MinMaxScaler fitted ranges, so every row is inside the training domain.
+
+import joblib
+import numpy as np
+import pandas as pd
+
+import leagues
+
+
+# Wrapper name in main.py -> input columns in wrapper order; one outcome model per registry league
+MODELS = {
+    **{league.wrapper_name: leagues.OUTCOME_COLUMNS for league in leagues.registry.values()},
+    "epl_goalsmodel": ['match_period', 'minute_in_half', 'possession_team', 'play_pattern', 'position', 'x', 'y'],
+    "messi_goalsmodel": ['match_period', 'minute_in_half', 'play_pattern', 'under_pressure', 'x', 'y'],
+}
+
+# Wrapper name in main.py -> pickled pipeline
+MODEL_FILES = {
+    **{league.wrapper_name: league.model_file for league in leagues.registry.values()},
+    "epl_goalsmodel": "eplgoalsmodel_rf.pkl",
+    "messi_goalsmodel": "messigoalsmodel_rf.pkl",
+}
+
+# Low-latency tier written by train_fast_models.py
+FAST_MODEL_FILES = {
+    **{league.wrapper_name: league.fast_model_file for league in leagues.registry.values()},
+    "epl_goalsmodel": "eplgoalsmodel_fast.pkl",
+    "messi_goalsmodel": "messigoalsmodel_fast.pkl",
+}
+
+# Label column of each task in the cleaned notebook frames
+TARGETS = {
+    **{league.wrapper_name: "winner_home" for league in leagues.registry.values()},
+    "epl_goalsmodel": "shot_outcome",
+    "messi_goalsmodel": "shot_outcome",
+}
+
+# Columns the wrappers expect as ints rather than floats
+INT_COLUMNS = {'match_period', 'minute_in_half'}
+
+
+def feature_domain(model):
+    # Returns {column: ("num", (low, high))} or {column: ("cat", categories)}
+    domain = {}
+    for name, transformer, cols in model.named_steps['preprocessor'].transformers_:
+        if name == "num":
+            scaler = transformer.named_steps['scaler']
+            for col, low, high in zip(cols, scaler.data_min_, scaler.data_max_):
+                domain[col] = ("num", (float(low), float(high)))
+        elif name == "cat":
+            encoder = transformer.named_steps['encoder']
+            for col, cats in zip(cols, encoder.categories_):
+                domain[col] = ("cat", list(cats))
+    return domain
+
+
+# Fitted sklearn pipeline to sample a task's inputs from; the onnx and shared
+# engines of main.py do not expose the encoder and scaler
+def sampling_model(wrapper_name, model):
+    return model if hasattr(model, "named_steps") else joblib.load(MODEL_FILES[wrapper_name])
+
+
+def sample_frame(model, columns, n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    domain = feature_domain(model)
+    data = {}
+    for col in columns:
+        kind, values = domain[col]
+        if kind == "num":
+            low, high = values
+            if col in INT_COLUMNS:
+                data[col] = rng.integers(int(low), int(high) + 1, size=n_rows)
+            else:
+                data[col] = rng.uniform(low, high, size=n_rows)
+        else:
+            data[col] = np.asarray(values)[rng.integers(0, len(values), size=n_rows)]
+    return pd.DataFrame(data, columns=columns)
+
+
+# Rows as plain Python values, in the order the wrappers take their arguments
+def sample_rows(model, columns, n_rows, seed=0):
+    df = sample_frame(model, columns, n_rows, seed)
+    return [tuple(v.item() if hasattr(v, "item") else v for v in row) for row in df.itertuples(index=False)]
@@ -0,0 +1,91 @@
+# load_test.py
+#
+# HTTP load test against a local uvicorn instance of main:app.
+# A fixed number of client threads post pre-generated payloads back to back
+# for a fixed duration; latency percentiles and throughput are reported per route.
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, workers=1, env=None):
+    cmd = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+           "--workers", str(workers), "--log-level", "warning"]
+    return subprocess.Popen(cmd, env={**os.environ, **(env or {})})
+
+
+# Polls /health, returns seconds until the server reported "ok" (not "warming")
+def wait_until_healthy(base_url, timeout=120.0):
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            with urllib.request.urlopen(f"{base_url}/health", timeout=1) as resp:
+                if resp.status == 200 and json.loads(resp.read()).get("status") == "ok":
+                    return time.perf_counter() - start
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"{base_url} did not become healthy within {timeout}s")
+
+
+def _post(url, body):
+    req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"}, method="POST")
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            resp.read()
+            return resp.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def run_load(url, payloads, concurrency=8, duration=10.0):
+    bodies = [json.dumps(p).encode() for p in payloads]
+    latencies = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    deadline = time.perf_counter() + duration
+
+    def client(i):
+        j = i
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status = _post(url, bodies[j % len(bodies)])
+            latencies[i].append(time.perf_counter() - start)
+            if status != 200:
+                errors[i] += 1
+            j += concurrency
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    all_latencies = np.concatenate([np.asarray(l) for l in latencies]) if any(latencies) else np.zeros(0)
+    p50, p95, p99 = np.percentile(all_latencies, [50, 95, 99]) if len(all_latencies) else (None, None, None)
+    return {
+        "requests": int(len(all_latencies)),
+        "errors": int(sum(errors)),
+        "concurrency": concurrency,
+        "duration_s": elapsed,
+        "throughput_rps": len(all_latencies) / elapsed,
+        "p50_s": float(p50) if p50 is not None else None,
+        "p95_s": float(p95) if p95 is not None else None,
+        "p99_s": float(p99) if p99 is not None else None,
+    }
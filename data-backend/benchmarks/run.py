@@ -0,0 +1,170 @@
+# run.py
+#
+# Reproducible benchmark suite for the prediction service. Run from data-backend/:
+#
+#   python -m benchmarks.run --out bench.json
+#   python -m benchmarks.run --out bench.json --baseline benchmarks/baseline.json
+#   python -m benchmarks.run --tiers --eval-data epl_goalsmodel=holdout.csv --skip-http
+#   python -m benchmarks.run --engines --onnx-threads 1 2 4 --skip-http
+#   python -m benchmarks.run --explain --explain-target-ms 5 --skip-http
+#
+# With --baseline the run exits non-zero when any timing regressed by more than --tolerance.
+# With --explain it also exits non-zero when an uncached explanation misses --explain-target-ms per row.
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from benchmarks import bench_engines, bench_explain, bench_models, bench_tiers, load_test
+from benchmarks.inputs import MODELS, sample_rows, sampling_model
+
+
+# Metric names where a larger value is better; every other *_s metric is a latency
+HIGHER_IS_BETTER = ("rows_per_s", "throughput_rps")
+COMPARED = ("median_s", "p50_s", "p95_s", "p99_s", "rows_per_s", "throughput_rps",
+            "process_median_s", "import_main_median_s", "latency_1_s", "latency_1000_s",
+            "ms_per_row", "listening_median_s", "healthy_median_s", "first_prediction_median_s")
+
+
+def environment():
+    info = {"python": platform.python_version(), "platform": platform.platform(), "cpu_count": os.cpu_count()}
+    for module in ("numpy", "pandas", "sklearn", "fastapi", "pydantic"):
+        try:
+            info[module] = __import__(module).__version__
+        except ImportError:
+            info[module] = None
+    try:
+        info["git_sha"] = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        info["git_sha"] = None
+    return info
+
+
+# Single-row prediction route of each model; MODEL_ROUTES also lists the batch and explain routes
+def predict_routes(main):
+    return {model: path for path, model in main.MODEL_ROUTES.items()
+            if path.startswith("/predict/") and not path.startswith("/predict/batch/")}
+
+
+def http_benchmarks(main, concurrency, duration, n_payloads=256):
+    port = load_test.free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    server = load_test.start_server(port)
+    try:
+        results = {"time_to_healthy_s": load_test.wait_until_healthy(base_url)}
+        routes = predict_routes(main)
+        for wrapper_name, columns in MODELS.items():
+            rows = sample_rows(sampling_model(wrapper_name, main.WRAPPERS[wrapper_name][1]()), columns, n_payloads)
+            payloads = [dict(zip(columns, row)) for row in rows]
+            results[wrapper_name] = load_test.run_load(base_url + routes[wrapper_name], payloads, concurrency, duration)
+        results["total_s"] = time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return results
+
+
+def _flatten(tree, prefix=""):
+    flat = {}
+    for key, value in tree.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(_flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+
+# Returns [(metric, baseline, current, relative change)] for every regression beyond tolerance
+def compare(current, baseline, tolerance):
+    cur, base = _flatten(current["results"]), _flatten(baseline["results"])
+    regressions = []
+    for path, old in base.items():
+        new = cur.get(path)
+        name = path.rsplit(".", 1)[-1]
+        if new is None or name not in COMPARED or not old:
+            continue
+        change = (new - old) / old
+        worse = -change if name in HIGHER_IS_BETTER else change
+        if worse > tolerance:
+            regressions.append((path, old, new, change))
+    return regressions
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the prediction models and API")
+    parser.add_argument("--out", default="bench.json")
+    parser.add_argument("--baseline", help="previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative slowdown")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=list(bench_models.BATCH_SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load per route")
+    parser.add_argument("--skip-http", action="store_true")
+    parser.add_argument("--skip-cold-start", action="store_true")
+    parser.add_argument("--tiers", action="store_true", help="compare accurate and fast tier models")
+    parser.add_argument("--engines", action="store_true", help="compare sklearn and onnxruntime (run export_onnx.py first)")
+    parser.add_argument("--onnx-threads", type=int, nargs="+", default=[1], help="intra-op thread counts to try")
+    parser.add_argument("--explain", action="store_true", help="time the /explain attributions per row")
+    parser.add_argument("--explain-target-ms", type=float, default=bench_explain.TARGET_MS_PER_ROW)
+    parser.add_argument("--eval-data", action="append", default=[], metavar="TASK=CSV",
+                        help="held-out labelled rows for Brier/log-loss in the tier comparison")
+    args = parser.parse_args(argv)
+
+    # Metrics middleware off so the numbers match a METRICS_ENABLED=0 deployment unless asked otherwise
+    os.environ.setdefault("METRICS_ENABLED", "0")
+    import main
+    # In-process benchmarks need the models even when STARTUP_MODE=background is set
+    main.startup.warmup.run(main.load_models)
+
+    results = {
+        "wrappers": bench_models.bench_wrappers(main, args.batch_sizes, args.repeat),
+        "model_load": bench_models.bench_model_load(),
+    }
+    if args.tiers:
+        results["tiers"] = bench_tiers.bench_tiers(dict(item.split("=", 1) for item in args.eval_data))
+    if args.engines:
+        results["engines"] = bench_engines.bench_engines(repeat=args.repeat, threads=args.onnx_threads)
+    if args.explain:
+        results["explain"] = bench_explain.bench_explain(repeat=args.repeat, target_ms=args.explain_target_ms)
+    if not args.skip_cold_start:
+        results["cold_start"] = bench_models.bench_cold_start()
+        route = next(path for path, model in main.MODEL_ROUTES.items() if model == "epl_outcomemodel")
+        columns = MODELS["epl_outcomemodel"]
+        payload = dict(zip(columns, sample_rows(sampling_model("epl_outcomemodel", main.WRAPPERS["epl_outcomemodel"][1]()), columns, 1)[0]))
+        results["startup"] = bench_models.bench_startup(route, payload)
+    if not args.skip_http:
+        results["http"] = http_benchmarks(main, args.concurrency, args.duration)
+
+    report = {"environment": environment(), "config": vars(args), "results": results}
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.out}")
+
+    status = 0
+    if args.explain:
+        for wrapper_name, per_size in results["explain"].items():
+            for n_rows, entry in per_size.items():
+                if not entry["within_target"]:
+                    print(f"EXPLAIN TOO SLOW {wrapper_name} batch {n_rows}: {entry['ms_per_row']:.2f} ms/row > {args.explain_target_ms} ms")
+                    status = 1
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        for path, old, new, change in regressions:
+            print(f"REGRESSION {path}: {old:.6g} -> {new:.6g} ({change:+.1%})")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
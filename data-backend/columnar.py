@@ -0,0 +1,180 @@
+# columnar.py
+#
+# Column-oriented batch payloads for high-volume clients. A request carries one
+# array per feature instead of one object per row:
+#
+#   {"columns": {"x": [100.0, 95.5], "match_period": [1, 2],
+#                "play_pattern": {"codes": [0, 0], "dictionary": ["Regular Play"]}}}
+#
+# Categorical columns may be plain string arrays or dictionary-encoded (codes
+# into a list of distinct values). Bodies may be JSON, msgpack (same layout) or
+# an Arrow IPC stream (application/vnd.apache.arrow.stream), where Arrow
+# dictionary arrays map straight onto codes + dictionary.
+#
+# Validation is done per column with numpy, not per row: types are checked with
+# one array conversion, and categorical strings are cleaned once per distinct
+# value before being expanded back to rows.
+#
+# Responses are negotiated from the Accept header: JSON (default), msgpack, or
+# an Arrow IPC stream with a single float64 "prediction" column.
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from fastapi import HTTPException
+from fastapi.responses import Response
+
+
+MAX_ROWS = int(os.getenv("BATCH_MAX_ROWS", "100000"))
+
+ARROW = "application/vnd.apache.arrow.stream"
+MSGPACK = ("application/msgpack", "application/x-msgpack")
+JSON = "application/json"
+
+
+def _invalid(column, message):
+    raise HTTPException(status_code=422, detail=f"column {column!r}: {message}")
+
+
+def _clean(values):
+    # Same normalisation as preprocessing_utils.clean_categories, on an array of str
+    return np.char.replace(np.char.lower(values.astype(str)), " ", "_").astype(object)
+
+
+def _categorical(column, raw, n_rows):
+    if isinstance(raw, dict):
+        try:
+            codes = np.asarray(raw["codes"], dtype=np.int64)
+            dictionary = np.asarray(raw["dictionary"], dtype=object)
+        except (KeyError, TypeError, ValueError):
+            _invalid(column, "dictionary-encoded columns need integer 'codes' and a 'dictionary' list")
+        if codes.ndim != 1 or dictionary.ndim != 1:
+            _invalid(column, "'codes' and 'dictionary' must be flat lists")
+        if pd.api.types.infer_dtype(dictionary, skipna=False) != "string":
+            _invalid(column, "dictionary values must be strings")
+        if len(codes) and (codes.min() < 0 or codes.max() >= len(dictionary)):
+            _invalid(column, "codes out of range for the dictionary")
+    else:
+        values = np.asarray(raw, dtype=object)
+        if values.ndim != 1 or pd.api.types.infer_dtype(values, skipna=False) != "string":
+            _invalid(column, "expected an array of strings")
+        dictionary, codes = np.unique(values.astype(str), return_inverse=True)
+    if len(codes) != n_rows:
+        _invalid(column, f"expected {n_rows} values, got {len(codes)}")
+    return _clean(np.asarray(dictionary))[codes]
+
+
+def _numeric(column, raw, annotation, n_rows):
+    try:
+        values = np.asarray(raw, dtype=np.float64)
+    except (TypeError, ValueError):
+        _invalid(column, "expected an array of numbers")
+    if values.ndim != 1 or len(values) != n_rows:
+        _invalid(column, f"expected {n_rows} values")
+    if not np.isfinite(values).all():
+        _invalid(column, "values must be finite")
+    if annotation is int:
+        if not (values == np.round(values)).all():
+            _invalid(column, "expected integers")
+        return values.astype(np.int64)
+    if annotation is bool:
+        if not np.isin(values, (0, 1)).all():
+            _invalid(column, "expected booleans")
+        return values.astype(bool)
+    return values
+
+
+# Columns in the order of the schema's fields, validated against their annotations
+def build_frame(schema, columns):
+    if not isinstance(columns, dict):
+        raise HTTPException(status_code=422, detail="body must contain a 'columns' object")
+    fields = schema.model_fields
+    missing = [name for name in fields if name not in columns]
+    if missing:
+        raise HTTPException(status_code=422, detail=f"missing columns: {missing}")
+
+    first = columns[next(iter(fields))]
+    try:
+        n_rows = len(first["codes"]) if isinstance(first, dict) else len(first)
+    except (KeyError, TypeError):
+        _invalid(next(iter(fields)), "expected an array")
+    if n_rows == 0 or n_rows > MAX_ROWS:
+        raise HTTPException(status_code=422, detail=f"batches must have between 1 and {MAX_ROWS} rows")
+
+    data = {}
+    for name, field in fields.items():
+        if field.annotation is str:
+            data[name] = _categorical(name, columns[name], n_rows)
+        else:
+            data[name] = _numeric(name, columns[name], field.annotation, n_rows)
+    return pd.DataFrame(data, columns=list(fields))
+
+
+def _arrow_columns(body):
+    import pyarrow as pa
+
+    table = pa.ipc.open_stream(body).read_all()
+    columns = {}
+    for name in table.column_names:
+        array = table.column(name).combine_chunks()
+        if pa.types.is_dictionary(array.type):
+            columns[name] = {"codes": array.indices.to_numpy(zero_copy_only=False),
+                             "dictionary": array.dictionary.to_pylist()}
+        else:
+            columns[name] = array.to_numpy(zero_copy_only=False)
+    return columns
+
+
+def decode_columns(body, content_type):
+    content_type = (content_type or JSON).split(";")[0].strip().lower()
+    try:
+        if content_type == ARROW:
+            return _arrow_columns(body)
+        if content_type in MSGPACK:
+            import msgpack
+            payload = msgpack.unpackb(body)
+        elif content_type == JSON:
+            payload = json.loads(body)
+        else:
+            raise HTTPException(status_code=415, detail=f"unsupported content type {content_type!r}")
+    except ImportError:
+        raise HTTPException(status_code=415, detail=f"{content_type} support is not installed")
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(status_code=400, detail="could not decode request body")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=422, detail="body must contain a 'columns' object")
+    return payload.get("columns")
+
+
+# Response media type for an Accept header; raises 406 before any work is done
+def negotiate(accept):
+    for part in (accept or JSON).split(","):
+        media_type = part.split(";")[0].strip().lower()
+        if media_type == ARROW or media_type in MSGPACK:
+            return media_type
+        if media_type in (JSON, "*/*", "application/*"):
+            return JSON
+    raise HTTPException(status_code=406, detail=f"supported response types: {JSON}, {ARROW}, {MSGPACK[0]}")
+
+
+def encode_predictions(predictions, model_tier, media_type):
+    predictions = np.asarray(predictions, dtype=np.float64)
+    try:
+        if media_type == ARROW:
+            import pyarrow as pa
+            table = pa.table({"prediction": predictions}).replace_schema_metadata({"model_tier": model_tier})
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return Response(sink.getvalue().to_pybytes(), media_type=ARROW)
+        if media_type in MSGPACK:
+            import msgpack
+            body = msgpack.packb({"prediction": predictions.tolist(), "model_tier": model_tier})
+            return Response(body, media_type=media_type)
+    except ImportError:
+        raise HTTPException(status_code=406, detail=f"{media_type} support is not installed")
+    return Response(json.dumps({"prediction": predictions.tolist(), "model_tier": model_tier}), media_type=JSON)
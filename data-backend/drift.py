@@ -0,0 +1,286 @@
+# drift.py
+#
+# Input drift and throughput monitor for the prediction routes.
+#
+# The request path only appends (features, prediction) to a fixed-size ring
+# buffer per model: a slot index from itertools.count (atomic under the GIL)
+# and one list item assignment, so recording takes no lock and memory stays at
+# MONITOR_BUFFER rows per model however busy the service is. Batch routes
+# record at most MONITOR_BATCH_SAMPLE rows per request, and MONITOR_SAMPLE_RATE
+# keeps that share of rows on every route, single or batch.
+#
+# A background task copies the buffers every MONITOR_INTERVAL seconds and
+# compares them with the training distributions:
+#   - per-feature histograms and PSI (population stability index) against the
+#     training summaries in MONITOR_SUMMARIES, written by
+#       python drift.py --data epl_outcomemodel=../data/eplmatches5y_clean.csv ...
+#   - numeric values outside the range the scaler was fitted on, and categories
+#     the encoder has never seen, straight from the fitted pipeline (available
+#     even without summaries; ONNX models carry them in their sidecar)
+#   - prediction histogram and PSI, and requests per second per model
+# The latest report is served by /monitoring/drift; PSI values also go to /metrics.
+#
+# PSI rule of thumb: < 0.1 stable, 0.1-0.25 moderate shift, > 0.25 major shift.
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+import metrics
+
+
+ENABLED = os.getenv("MONITOR_ENABLED", "1") != "0"
+BUFFER_ROWS = int(os.getenv("MONITOR_BUFFER", "10000"))
+BATCH_SAMPLE = int(os.getenv("MONITOR_BATCH_SAMPLE", "32"))
+SAMPLE_RATE = float(os.getenv("MONITOR_SAMPLE_RATE", "1"))
+INTERVAL = float(os.getenv("MONITOR_INTERVAL", "60"))
+# Fewer buffered rows than this give no PSI (too noisy to alert on)
+MIN_SAMPLES = int(os.getenv("MONITOR_MIN_SAMPLES", "100"))
+SUMMARIES_PATH = os.getenv("MONITOR_SUMMARIES", "training_summaries.json")
+
+NUMERIC_BINS = 10
+PREDICTION_EDGES = [i / 10 for i in range(11)]
+# Floor for empty bins, so PSI stays finite
+EPSILON = 1e-4
+
+logger = logging.getLogger(__name__)
+
+
+def _clean(value):
+    return value.lower().replace(" ", "_") if isinstance(value, str) else value
+
+
+def _category_key(value):
+    # JSON keys are strings, and float categories such as 5.0 must match live 5.0
+    value = _clean(value)
+    return str(float(value)) if isinstance(value, (int, float)) and not isinstance(value, bool) else str(value)
+
+
+def psi(expected, actual):
+    expected = np.maximum(np.asarray(expected, dtype=float), EPSILON)
+    actual = np.maximum(np.asarray(actual, dtype=float), EPSILON)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def _shares(counts):
+    counts = np.asarray(counts, dtype=float)
+    total = counts.sum()
+    return counts / total if total else counts
+
+
+# Training summary of one feature column: quantile bins for numbers, shares per category
+def summarize_column(values):
+    values = np.asarray(values, dtype=object)
+    if all(isinstance(v, (int, float, np.number)) and not isinstance(v, (bool, np.bool_)) for v in values):
+        numbers = values.astype(float)
+        numbers = numbers[~np.isnan(numbers)]
+        edges = np.unique(np.quantile(numbers, np.linspace(0, 1, NUMERIC_BINS + 1))[1:-1]).tolist()
+        counts = np.bincount(np.searchsorted(edges, numbers, side="right"), minlength=len(edges) + 1)
+        return {"kind": "num", "edges": edges, "expected": _shares(counts).tolist()}
+    keys = [_category_key(v) for v in values]
+    categories = sorted(set(keys))
+    counts = [keys.count(c) for c in categories]
+    return {"kind": "cat", "categories": categories, "expected": _shares(counts).tolist()}
+
+
+def summarize(df, predictions):
+    counts = np.bincount(np.clip(np.searchsorted(PREDICTION_EDGES[1:-1], predictions, side="right"), 0, 9), minlength=10)
+    return {
+        "rows": len(df),
+        "features": {column: summarize_column(df[column].tolist()) for column in df.columns},
+        "prediction": {"edges": PREDICTION_EDGES, "expected": _shares(counts).tolist()},
+    }
+
+
+# Fitted numeric ranges and known categories of a pipeline's preprocessor
+def fitted_domain(model):
+    # Exported models without the sklearn pipeline carry it as domain_spec
+    spec = getattr(model, "domain_spec", None)
+    if spec is not None:
+        return {col: ("num", value[1], value[2]) if value[0] == "num" else ("cat", set(value[1]))
+                for col, value in spec.items()}
+    preprocessor = getattr(model, "named_steps", {}).get("preprocessor") or getattr(model, "preprocessor", None)
+    domain = {}
+    if preprocessor is None:
+        return domain
+    for name, transformer, cols in preprocessor.transformers_:
+        steps = dict(getattr(transformer, "steps", []))
+        if "scaler" in steps and hasattr(steps["scaler"], "data_min_"):
+            for col, low, high in zip(cols, steps["scaler"].data_min_, steps["scaler"].data_max_):
+                domain[col] = ("num", float(low), float(high))
+        elif "encoder" in steps and hasattr(steps["encoder"], "categories_"):
+            for col, cats in zip(cols, steps["encoder"].categories_):
+                domain[col] = ("cat", {_category_key(c) for c in cats})
+    return domain
+
+
+# fitted_domain as JSON, stored beside exported models (the ONNX sidecar)
+def domain_spec(model):
+    return {col: list(value) if value[0] == "num" else ["cat", sorted(value[1])]
+            for col, value in fitted_domain(model).items()}
+
+
+class RingBuffer:
+    def __init__(self, size):
+        self.size = size
+        self.slots = [None] * size
+        self._next = itertools.count()
+        self.written = 0
+
+    def append(self, row):
+        i = next(self._next)
+        self.slots[i % self.size] = row
+        self.written = i + 1
+
+    # Rows currently held, oldest first not guaranteed
+    def rows(self):
+        return [row for row in list(self.slots) if row is not None]
+
+
+class DriftMonitor:
+    def __init__(self, summaries_path=SUMMARIES_PATH):
+        self.summaries = {}
+        if os.path.exists(summaries_path):
+            with open(summaries_path) as f:
+                self.summaries = json.load(f)
+        self.models = {}
+        self.report = {"models": {}, "generated_at": None}
+        self._last = {}
+
+    # columns: wrapper argument order; model: the accurate pipeline, for fitted ranges.
+    # Registering again (a league model reloaded after eviction) keeps the samples.
+    def register(self, name, columns, model):
+        entry = self.models.get(name)
+        buffer = entry["buffer"] if entry is not None else RingBuffer(BUFFER_ROWS)
+        self.models[name] = {"columns": list(columns), "buffer": buffer, "domain": fitted_domain(model)}
+
+    def record(self, name, features, prediction):
+        if not ENABLED or (SAMPLE_RATE < 1 and random.random() >= SAMPLE_RATE):
+            return
+        entry = self.models.get(name)
+        if entry is not None:
+            entry["buffer"].append((tuple(features), None if prediction is None else float(prediction)))
+
+    def record_frame(self, name, df, predictions):
+        entry = self.models.get(name)
+        if not ENABLED or entry is None:
+            return
+        n = len(df)
+        picks = range(n) if n <= BATCH_SAMPLE else random.sample(range(n), BATCH_SAMPLE)
+        if SAMPLE_RATE < 1:
+            picks = [i for i in picks if random.random() < SAMPLE_RATE]
+        rows = df[entry["columns"]].to_numpy(dtype=object)
+        for i in picks:
+            entry["buffer"].append((tuple(rows[i]), None if predictions is None else float(predictions[i])))
+
+    def _feature_report(self, values, summary, domain):
+        report = {"samples": len(values)}
+        if domain is not None and domain[0] == "num":
+            numbers = np.asarray([v for v in values if v is not None], dtype=float)
+            report["fitted_range"] = [domain[1], domain[2]]
+            report["out_of_range_share"] = float(np.mean((numbers < domain[1]) | (numbers > domain[2]))) if len(numbers) else None
+        elif domain is not None:
+            report["unknown_category_share"] = float(np.mean([_category_key(v) not in domain[1] for v in values])) if values else None
+        if summary is None or len(values) < MIN_SAMPLES:
+            return report
+        if summary["kind"] == "num":
+            numbers = np.asarray(values, dtype=float)
+            counts = np.bincount(np.searchsorted(summary["edges"], numbers[~np.isnan(numbers)], side="right"), minlength=len(summary["edges"]) + 1)
+            report["histogram"] = {"edges": summary["edges"], "actual": _shares(counts).tolist(), "expected": summary["expected"]}
+            report["psi"] = psi(summary["expected"], _shares(counts))
+        else:
+            index = {c: i for i, c in enumerate(summary["categories"])}
+            counts = np.zeros(len(index) + 1)
+            for v in values:
+                counts[index.get(_category_key(v), len(index))] += 1
+            # Last bucket collects categories that never appeared in training
+            report["histogram"] = {"categories": summary["categories"] + ["<other>"], "actual": _shares(counts).tolist(), "expected": summary["expected"] + [0.0]}
+            report["psi"] = psi(summary["expected"] + [0.0], _shares(counts))
+        return report
+
+    def compute(self):
+        now = time.time()
+        models = {}
+        for name, entry in self.models.items():
+            buffer = entry["buffer"]
+            rows = buffer.rows()
+            written = buffer.written
+            last_written, last_time = self._last.get(name, (written, now))
+            self._last[name] = (written, now)
+            summary = self.summaries.get(name, {})
+            features = {}
+            for i, column in enumerate(entry["columns"]):
+                values = [row[0][i] for row in rows]
+                features[column] = self._feature_report(values, summary.get("features", {}).get(column), entry["domain"].get(column))
+                if "psi" in features[column]:
+                    metrics.set_gauge("feature_psi", features[column]["psi"], model=name, feature=column)
+            predictions = np.asarray([row[1] for row in rows if row[1] is not None], dtype=float)
+            prediction = {"samples": len(predictions), "mean": float(predictions.mean()) if len(predictions) else None}
+            if "prediction" in summary and len(predictions) >= MIN_SAMPLES:
+                counts = np.bincount(np.clip(np.searchsorted(PREDICTION_EDGES[1:-1], predictions, side="right"), 0, 9), minlength=10)
+                prediction["histogram"] = {"edges": PREDICTION_EDGES, "actual": _shares(counts).tolist(), "expected": summary["prediction"]["expected"]}
+                prediction["psi"] = psi(summary["prediction"]["expected"], _shares(counts))
+                metrics.set_gauge("prediction_psi", prediction["psi"], model=name)
+            models[name] = {
+                "recorded_total": written,
+                "recorded_per_s": (written - last_written) / (now - last_time) if now > last_time else None,
+                "buffered": len(rows),
+                "has_training_summary": bool(summary),
+                "features": features,
+                "prediction": prediction,
+            }
+        self.report = {"models": models, "generated_at": now, "interval_s": INTERVAL, "buffer_rows": BUFFER_ROWS}
+        return self.report
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(INTERVAL)
+            try:
+                await asyncio.to_thread(self.compute)
+            except Exception:
+                logger.exception("drift report failed")
+
+
+monitor = DriftMonitor()
+
+
+def main():
+    import joblib
+    import pandas as pd
+
+    from benchmarks.inputs import MODELS, MODEL_FILES
+    from preprocessing_utils import clean_categories
+
+    parser = argparse.ArgumentParser(description="Write training summaries for the drift monitor")
+    parser.add_argument("--data", action="append", default=[], metavar="TASK=CSV",
+                        help="cleaned training frame of a task, as in train_fast_models.py")
+    parser.add_argument("--out", default=SUMMARIES_PATH)
+    args = parser.parse_args()
+
+    summaries = {}
+    if os.path.exists(args.out):
+        with open(args.out) as f:
+            summaries = json.load(f)
+    for item in args.data:
+        wrapper_name, csv_path = item.split("=", 1)
+        columns = MODELS[wrapper_name]
+        df = pd.read_csv(csv_path)[columns]
+        predictions = joblib.load(MODEL_FILES[wrapper_name]).predict_proba(clean_categories(df.copy()))[:, 1]
+        summaries[wrapper_name] = summarize(df, predictions)
+        print(f"{wrapper_name}: {len(df)} rows from {csv_path}")
+    with open(args.out, "w") as f:
+        json.dump(summaries, f, indent=2)
+    print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+# explain.py
+#
+# Per-prediction explanations for the RandomForest pipelines behind the
+# /explain routes. Each row's probability is split into a base value (the
+# forest's average leaf fraction over the training set) plus one contribution
+# per input column, and the contributions always sum to the prediction:
+#
+#   prediction = base_value + sum(contributions.values())
+#
+# Contributions come from the decision paths (the Saabas decomposition that
+# TreeSHAP refines): every split a row passes through moves the positive-class
+# fraction from the parent node to the child, and that change is credited to
+# the split's feature. The forests are flattened into the same node arrays as
+# shared_models.py, so all rows and trees walk one tree level per numpy step,
+# and the credits land in a single bincount. One-hot columns are then summed
+# back onto the input column they came from.
+#
+# For small batches ColumnTransformer.transform costs more than the forest walk,
+# so the notebooks' preprocessor layout (mean imputer + MinMaxScaler, one-hot
+# encoder) is replayed from its fitted parameters with numpy and dict lookups;
+# other layouts fall back to the preprocessor itself.
+#
+# Results are cached per cleaned feature vector (EXPLAIN_CACHE_SIZE entries);
+# a batch only walks the forest for rows that are not cached.
+
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from sklearn.impute import SimpleImputer
+from sklearn.preprocessing import MinMaxScaler, OneHotEncoder
+
+from shared_models import flatten_forest
+
+
+CACHE_SIZE = int(os.getenv("EXPLAIN_CACHE_SIZE", "10000"))
+# Rows walked per step; bounds the (rows x trees x depth) temporaries of large batches
+CHUNK_ROWS = 256
+
+
+# Input column behind every column the preprocessor outputs
+def _input_columns(preprocessor):
+    owners = []
+    for name, transformer, cols in preprocessor.transformers_:
+        if name == "remainder" or transformer == "drop":
+            continue
+        last = transformer.steps[-1][1] if hasattr(transformer, "steps") else transformer
+        if hasattr(last, "categories_"):
+            for col, cats in zip(cols, last.categories_):
+                owners.extend([col] * len(cats))
+        else:
+            owners.extend(cols)
+    return owners
+
+
+# Fitted preprocessor replayed with numpy; raises ValueError for layouts it does not know
+class _Encoder:
+    def __init__(self, preprocessor):
+        self.parts = []
+        self.width = 0
+        for name, transformer, cols in preprocessor.transformers_:
+            if name == "remainder" or transformer == "drop":
+                continue
+            steps = dict(transformer.steps) if hasattr(transformer, "steps") else {}
+            imputer, scaler, encoder = steps.get("imputer"), steps.get("scaler"), steps.get("encoder")
+            if isinstance(imputer, SimpleImputer) and isinstance(scaler, MinMaxScaler) and len(steps) == 2 \
+                    and imputer.strategy in ("mean", "median") and not imputer.add_indicator:
+                self.parts.append(("num", list(cols), self.width, (imputer.statistics_, scaler.scale_, scaler.min_)))
+                self.width += len(cols)
+            # Unknown values are replayed as all-zero rows, which only matches "ignore";
+            # other settings raise or warn in sklearn, so those go through pipeline.transform
+            elif isinstance(encoder, OneHotEncoder) and encoder.drop is None and encoder.handle_unknown == "ignore" \
+                    and getattr(encoder, "_infrequent_enabled", False) is False:
+                lookups = []
+                for cats in encoder.categories_:
+                    known = [value for value in cats if value == value]
+                    lookups.append(({value: i for i, value in enumerate(known)}, len(known) if len(known) < len(cats) else None))
+                self.parts.append(("cat", list(cols), self.width, lookups))
+                self.width += sum(len(cats) for cats in encoder.categories_)
+            else:
+                raise ValueError(f"no fast path for the {name!r} transformer")
+
+    def transform(self, df):
+        X = np.zeros((len(df), self.width), dtype=np.float32)
+        for kind, cols, offset, params in self.parts:
+            if kind == "num":
+                statistics, scale, minimum = params
+                values = df[cols].to_numpy(dtype=np.float64)
+                values = np.where(np.isnan(values), statistics, values)
+                X[:, offset:offset + len(cols)] = values * scale + minimum
+                continue
+            for col, (lookup, nan_index) in zip(cols, params):
+                for row, value in enumerate(df[col].tolist()):
+                    # NaN only matches a NaN category; unknown values stay all-zero (handle_unknown="ignore")
+                    index = nan_index if value != value else lookup.get(value)
+                    if index is not None:
+                        X[row, offset + index] = 1.0
+                offset += len(lookup) + (nan_index is not None)
+        return X
+
+
+class ForestExplainer:
+    def __init__(self, pipeline, positive_class=1):
+        forest = pipeline.named_steps['classifier']
+        self._setup(pipeline.named_steps['preprocessor'], flatten_forest(forest), forest.classes_,
+                    int(max(e.tree_.max_depth for e in forest.estimators_)), forest.n_features_in_, positive_class)
+
+    # Explainer over a shared_models.SharedForestModel's memory-mapped node arrays,
+    # so INFERENCE_ENGINE=shared workers never unpickle the forest
+    @classmethod
+    def from_shared(cls, model, positive_class=1):
+        explainer = cls.__new__(cls)
+        arrays = {"feature": model.feature, "threshold": model.threshold, "left": model.left,
+                  "right": model.right, "value": model.value, "roots": model.roots}
+        explainer._setup(model.preprocessor, arrays, model.classes_, model.max_depth, model.n_features, positive_class)
+        return explainer
+
+    def _setup(self, preprocessor, arrays, classes, max_depth, n_features, positive_class):
+        self.preprocessor = preprocessor
+        try:
+            self.encoder = _Encoder(self.preprocessor)
+        except ValueError:
+            self.encoder = None
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.roots = arrays["roots"]
+        self.value = arrays["value"][:, list(classes).index(positive_class)]
+        self.max_depth = max_depth
+        self.n_features = n_features
+        self.base_value = float(self.value[self.roots].mean())
+
+        owners = _input_columns(self.preprocessor)
+        if len(owners) != self.n_features:
+            raise ValueError(f"preprocessor outputs {len(owners)} columns, forest expects {self.n_features}")
+        self.columns = list(dict.fromkeys(owners))
+        # (encoded feature x input column) 0/1 matrix that folds one-hot columns back together
+        self.fold = np.zeros((self.n_features, len(self.columns)))
+        self.fold[np.arange(self.n_features), [self.columns.index(owner) for owner in owners]] = 1.0
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # (predictions, contributions per input column) for rows of an already encoded matrix
+    def _explain_encoded(self, X):
+        n_rows, n_trees = X.shape[0], len(self.roots)
+        rows = np.arange(n_rows)[:, None]
+        node = np.broadcast_to(self.roots, (n_rows, n_trees))
+        row_ids, features, deltas = [], [], []
+        for _ in range(self.max_depth):
+            split_feature = self.feature[node]
+            go_left = X[rows, split_feature] <= self.threshold[node]
+            child = np.where(go_left, self.left[node], self.right[node])
+            # Leaves point at themselves, so their delta is 0
+            row_ids.append(np.broadcast_to(rows, node.shape))
+            features.append(split_feature)
+            deltas.append(self.value[child] - self.value[node])
+            node = child
+        flat = (np.stack(row_ids) * self.n_features + np.stack(features)).ravel()
+        encoded = np.bincount(flat, weights=np.stack(deltas).ravel(), minlength=n_rows * self.n_features)
+        contributions = encoded.reshape(n_rows, self.n_features) / n_trees @ self.fold
+        return self.value[node].mean(axis=1), contributions
+
+    # Encoded float32 matrix, as sklearn trees compare float32 features against float64 thresholds
+    def encode(self, df):
+        if self.encoder is not None:
+            return self.encoder.transform(df)
+        X = self.preprocessor.transform(df)
+        if hasattr(X, "toarray"):
+            X = X.toarray()
+        return np.asarray(X, dtype=np.float32)
+
+    # Takes a cleaned frame; returns one {"prediction", "base_value", "contributions"} dict per row
+    def explain(self, df):
+        keys = list(df.itertuples(index=False, name=None))
+        with self._lock:
+            results = [self._cache.get(key) for key in keys]
+            for key, result in zip(keys, results):
+                if result is not None:
+                    self._cache.move_to_end(key)
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            X = self.encode(df.iloc[missing])
+            chunks = [self._explain_encoded(X[start:start + CHUNK_ROWS]) for start in range(0, len(X), CHUNK_ROWS)]
+            predictions = np.concatenate([chunk[0] for chunk in chunks])
+            contributions = np.concatenate([chunk[1] for chunk in chunks])
+            with self._lock:
+                for i, prediction, row in zip(missing, predictions, contributions):
+                    results[i] = {
+                        "prediction": float(prediction),
+                        "base_value": self.base_value,
+                        "contributions": dict(zip(self.columns, row.tolist())),
+                    }
+                    self._cache[keys[i]] = results[i]
+                while len(self._cache) > CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        with self._lock:
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+        return results
+
+    def cache_info(self):
+        return self.hits, self.misses
@@ -0,0 +1,188 @@
+# export_onnx.py
+#
+# Converts each *_rf.pkl pipeline to ONNX for INFERENCE_ENGINE=onnx and checks
+# parity with the native pipeline. Export-time only dependency: pip install skl2onnx
+#
+#   python export_onnx.py            # export every model and check parity
+#   python export_onnx.py --rows 5000 --tolerance 1e-6
+#
+# The FunctionTransformer(clean_categories) step is dropped from the exported
+# graph: it is plain Python and is applied in pandas before inference anyway.
+#
+# Numeric imputation and scaling are left out of the graph as well. sklearn
+# imputes and scales in float64 and the forest then casts to float32; ONNX has
+# no float64 Imputer, and scaling in float32 rounds differently, so values on a
+# split threshold (integers from the frontend sliders, typically) took the other
+# branch. The sidecar holds the fitted fill/scale/offset per column and
+# onnx_engine applies them in float64 before feeding the graph float32, as
+# sklearn does. The sidecar also keeps the fitted ranges and categories the
+# drift monitor reports against, since the pipeline is not loaded under ONNX.
+
+import argparse
+import copy
+import json
+import os
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+from skl2onnx import convert_sklearn
+from skl2onnx.common.data_types import FloatTensorType, Int64TensorType, StringTensorType
+
+import drift
+import onnx_engine
+from benchmarks.inputs import MODELS, MODEL_FILES, sample_frame
+from preprocessing_utils import clean_categories
+
+
+TARGET_OPSET = 15
+# Allowed max |diff| in probability; leaves are averaged in float32 by onnxruntime,
+# hence not exactly zero
+TOLERANCE = 1e-5
+
+
+def exportable(model):
+    model = copy.deepcopy(model)
+    preprocessor = model.named_steps['preprocessor']
+    for name, transformer, cols in preprocessor.transformers_:
+        if name == "cat":
+            transformer.steps = [step for step in transformer.steps if step[0] != "cleaner"]
+    # Numeric columns arrive already imputed and scaled (see numeric_scaling)
+    preprocessor.transformers_ = [(name, "passthrough", cols) if name == "num" else (name, transformer, cols)
+                                  for name, transformer, cols in preprocessor.transformers_]
+    return model
+
+
+# {column: [fill, scale, offset]} of the fitted SimpleImputer and MinMaxScaler
+def numeric_scaling(model):
+    scaling = {}
+    for name, transformer, cols in model.named_steps['preprocessor'].transformers_:
+        if name == "num":
+            imputer, scaler = transformer.named_steps['imputer'], transformer.named_steps['scaler']
+            for col, fill, scale, offset in zip(cols, imputer.statistics_, scaler.scale_, scaler.min_):
+                scaling[col] = [float(fill), float(scale), float(offset)]
+    return scaling
+
+
+# {column: learnt categories} of the fitted OneHotEncoder, NaN left out (JSON has none)
+def encoder_categories(model):
+    categories = {}
+    for name, transformer, cols in model.named_steps['preprocessor'].transformers_:
+        if name == "cat":
+            for col, cats in zip(cols, transformer.named_steps['encoder'].categories_):
+                categories[col] = [value.item() if hasattr(value, "item") else value for value in cats if value == value]
+    return categories
+
+
+# One graph input per column: numeric features as float, categorical features as
+# strings, or int64 when the encoder learnt numeric categories (table positions, flags)
+def input_spec(model, columns):
+    kinds = {}
+    for name, transformer, cols in model.named_steps['preprocessor'].transformers_:
+        if name == "num":
+            kinds.update({col: "float" for col in cols})
+        elif name == "cat":
+            encoder = transformer.named_steps['encoder']
+            for col, cats in zip(cols, encoder.categories_):
+                kinds[col] = "string" if cats.dtype == object else "int64"
+    return [[col, kinds[col]] for col in columns]
+
+
+# Rows whose scaled numeric values sit exactly on the forest's split thresholds,
+# one random (column, threshold) per row; everything else as in sample_frame
+def threshold_frame(model, columns, n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    df = sample_frame(model, columns, n_rows, seed)
+    preprocessor = model.named_steps['preprocessor']
+    num_slice = preprocessor.output_indices_["num"]
+    num_cols = next(cols for name, _, cols in preprocessor.transformers_ if name == "num")
+    scaling = numeric_scaling(model)
+    df[num_cols] = df[num_cols].astype(float)
+    splits = [(feature, threshold)
+              for tree in model.named_steps['classifier'].estimators_
+              for feature, threshold in zip(tree.tree_.feature, tree.tree_.threshold)
+              if num_slice.start <= feature < num_slice.stop]
+    for row, i in enumerate(rng.integers(0, len(splits), size=n_rows)):
+        feature, threshold = splits[i]
+        col = num_cols[feature - num_slice.start]
+        _, scale, offset = scaling[col]
+        df.loc[row, col] = (float(np.float32(threshold)) - offset) / scale
+    return df
+
+
+# Rows whose integer categories (table positions) are fractional or missing,
+# values sklearn's encoder treats as unknown
+def off_category_frame(model, columns, n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    df = sample_frame(model, columns, n_rows, seed)
+    for col, dtype in input_spec(model, columns):
+        if dtype == "int64" and df[col].dtype != bool:
+            values = df[col].astype(float)
+            pick = rng.integers(0, 3, size=n_rows)
+            df[col] = np.where(pick == 0, values + 0.5, np.where(pick == 1, np.nan, values))
+    return df
+
+
+# Uniform rows, the same rows rounded to integers (what the sliders send), rows
+# on split thresholds and rows with off-category integer values
+def parity_frame(model, columns, rows, seed=1):
+    uniform = sample_frame(model, columns, rows, seed)
+    integers = uniform.copy()
+    for col in numeric_scaling(model):
+        if col in integers:
+            integers[col] = np.round(integers[col].astype(float))
+    return pd.concat([uniform, integers, threshold_frame(model, columns, rows, seed),
+                      off_category_frame(model, columns, rows, seed)], ignore_index=True)
+
+
+def write_onnx(model, columns, onnx_path, source):
+    spec = input_spec(model, columns)
+    tensor_types = {"float": FloatTensorType, "int64": Int64TensorType, "string": StringTensorType}
+    initial_types = [(col, tensor_types[dtype]([None, 1])) for col, dtype in spec]
+    graph_model = exportable(model)
+    onx = convert_sklearn(graph_model, initial_types=initial_types, target_opset=TARGET_OPSET,
+                          options={id(graph_model.named_steps['classifier']): {"zipmap": False}})
+    with open(onnx_path, "wb") as f:
+        f.write(onx.SerializeToString())
+    with open(onnx_engine.spec_path(onnx_path), "w") as f:
+        json.dump({"inputs": spec, "scaling": numeric_scaling(model), "categories": encoder_categories(model),
+                   "domain": drift.domain_spec(model), "source": source}, f, indent=2)
+
+
+# |native - onnxruntime| probability per parity_frame row
+def parity_diff(model, columns, onnx_path, rows):
+    df = clean_categories(parity_frame(model, columns, rows))
+    native = model.predict_proba(df)[:, 1]
+    converted = onnx_engine.OnnxModel(onnx_path).predict_proba(df)[:, 1]
+    return np.abs(native - converted)
+
+
+def export(wrapper_name, rows, tolerance=TOLERANCE):
+    columns = MODELS[wrapper_name]
+    pkl_path = MODEL_FILES[wrapper_name]
+    onnx_path = pkl_path.replace(".pkl", ".onnx")
+    model = joblib.load(pkl_path)
+    write_onnx(model, columns, onnx_path, pkl_path)
+
+    # Parity with the native pipeline on rows from the training domain
+    diff = parity_diff(model, columns, onnx_path, rows)
+    ok = diff.max() <= tolerance
+    print(f"{wrapper_name}: {onnx_path} ({os.path.getsize(onnx_path) / 1e6:.1f} MB), {len(diff)} rows, "
+          f"max |diff| {diff.max():.2e}, mean {diff.mean():.2e} {'OK' if ok else 'PARITY FAILED'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the model pipelines to ONNX")
+    parser.add_argument("--rows", type=int, default=2000, help="rows per parity sample (uniform, integer, on-threshold, off-category)")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="allowed max |diff| in probability")
+    args = parser.parse_args()
+
+    results = [export(wrapper_name, args.rows, args.tolerance)
+               for wrapper_name, path in MODEL_FILES.items() if os.path.exists(path)]
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+# fixture_context.py
+#
+# Precomputed match context for the /predict/fixture and /predict/round routes.
+# The ingested SportMonks tables (fixtures joined with venues, weather reports
+# and standings, as written by the sportmonks notebooks) are loaded once into an
+# in-memory table, so a client only names a fixture instead of sending the
+# standings positions and five weather values itself.
+#
+# Features are derived the same way the notebooks did for training:
+#   match_temperature  the morning/day/evening/night reading for the kickoff hour
+#                      (readings of 100 or more are treated as missing)
+#   humidity, clouds   "58%" strings to numbers
+#   time_of_day        "earlier" up to the league's cutoff kickoff time, else "later"
+# Missing numeric values are left as NaN for the pipeline's mean imputer.
+#
+# Feature rows are built and cleaned once at load time; a fixture id maps to its
+# row and a round to its rows through plain dicts, and predictions are cached
+# per (fixture, model tier) so repeated reads skip the model entirely.
+
+import os
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+import leagues
+from preprocessing_utils import clean_categories
+
+
+FIXTURE_DATA_DIR = os.getenv("FIXTURE_DATA_DIR", "../data")
+
+# League -> (fixtures table, latest kickoff counted as "earlier"), from the league registry
+LEAGUES = {key: (league.context_table, league.kickoff_cutoff) for key, league in leagues.registry.items() if league.context_table}
+
+COLUMNS = leagues.OUTCOME_COLUMNS
+NUMERIC = [column for column, kind in leagues.OUTCOME_FIELDS.items() if kind is float]
+
+
+def _percent(values):
+    return pd.to_numeric(values.astype(str).str.rstrip('%'), errors='coerce')
+
+
+def _match_temperature(raw, hours):
+    temperature = np.select(
+        [(hours >= 6) & (hours < 12), (hours >= 12) & (hours < 18), (hours >= 18) & (hours < 21)],
+        [raw['temperature_morning'], raw['temperature_day'], raw['temperature_evening']],
+        default=raw['temperature_night'],
+    ).astype(float)
+    return np.where(temperature < 100, temperature, np.nan)
+
+
+# One row per fixture with the model's input columns plus fixture details
+def assemble(raw, cutoff):
+    raw = raw.drop_duplicates('fixture_id').reset_index(drop=True)
+    starting_at = pd.to_datetime(raw['starting_at'])
+    features = pd.DataFrame({
+        'position_away': pd.to_numeric(raw['position_away'], errors='coerce'),
+        'position_home': pd.to_numeric(raw['position_home'], errors='coerce'),
+        'match_temperature': _match_temperature(raw, starting_at.dt.hour),
+        'wind_speed': pd.to_numeric(raw['wind_speed'], errors='coerce'),
+        'humidity': _percent(raw['humidity']),
+        'pressure': pd.to_numeric(raw['pressure'], errors='coerce'),
+        'clouds': _percent(raw['clouds']),
+        'team_name_home': raw['team_name_home'].astype(str),
+        'team_name_away': raw['team_name_away'].astype(str),
+        'time_of_day': np.where(starting_at.dt.time <= cutoff, 'earlier', 'later'),
+    }, columns=COLUMNS)
+    features[NUMERIC] = features[NUMERIC].astype(float)
+    details = pd.DataFrame({
+        'fixture_id': raw['fixture_id'].astype(int),
+        'fixture_name': raw['fixture_name'].astype(str),
+        'round_id': raw['round_id'].astype(int),
+        'starting_at': starting_at.dt.strftime('%Y-%m-%d %H:%M:%S'),
+    })
+    return features, details
+
+
+class FixtureContext:
+    def __init__(self, tables):
+        # tables: league -> (features, details) as returned by assemble()
+        self.features = {}
+        self.fixtures = {}
+        self.rounds = {}
+        self._cache = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        for league, (features, details) in tables.items():
+            # Cleaned once here instead of on every request
+            self.features[league] = clean_categories(features.copy())
+            for row, fixture in enumerate(details.itertuples(index=False)):
+                self.fixtures[fixture.fixture_id] = {
+                    "league": league,
+                    "row": row,
+                    "fixture_id": fixture.fixture_id,
+                    "fixture_name": fixture.fixture_name,
+                    "round_id": fixture.round_id,
+                    "starting_at": fixture.starting_at,
+                }
+                self.rounds.setdefault((league, fixture.round_id), []).append(fixture.fixture_id)
+        for key, fixture_ids in self.rounds.items():
+            fixture_ids.sort(key=lambda fixture_id: self.fixtures[fixture_id]["starting_at"])
+
+    def __len__(self):
+        return len(self.fixtures)
+
+    def fixture(self, fixture_id):
+        return self.fixtures.get(fixture_id)
+
+    def round(self, league, round_id):
+        return [self.fixtures[fixture_id] for fixture_id in self.rounds.get((league, round_id), ())]
+
+    # Ids of the next n rounds that still have a fixture to play, earliest first
+    def upcoming_rounds(self, league, n, now=None):
+        now = (now or datetime.now(timezone.utc)).strftime('%Y-%m-%d %H:%M:%S')
+        upcoming = []
+        for (round_league, round_id), fixture_ids in self.rounds.items():
+            kickoffs = [self.fixtures[fixture_id]["starting_at"] for fixture_id in fixture_ids]
+            if round_league == league and max(kickoffs) >= now:
+                upcoming.append((min(kickoffs), round_id))
+        return [round_id for _, round_id in sorted(upcoming)[:n]]
+
+    def feature_row(self, fixture):
+        row = self.features[fixture["league"]].iloc[fixture["row"]]
+        return {column: (None if pd.isna(value) else value.item() if hasattr(value, "item") else value)
+                for column, value in row.items()}
+
+    # Predictions for fixtures of one league; cache misses are scored in a single predict_proba call
+    def predict(self, fixtures, model, model_tier):
+        with self._lock:
+            cached = [self._cache.get((fixture["fixture_id"], model_tier)) for fixture in fixtures]
+        missing = [i for i, prediction in enumerate(cached) if prediction is None]
+        if missing:
+            league = fixtures[missing[0]]["league"]
+            df = self.features[league].iloc[[fixtures[i]["row"] for i in missing]]
+            scored = model.predict_proba(df)[:, 1]
+            with self._lock:
+                for i, prediction in zip(missing, scored):
+                    cached[i] = self._cache[(fixtures[i]["fixture_id"], model_tier)] = float(prediction)
+        with self._lock:
+            self.hits += len(fixtures) - len(missing)
+            self.misses += len(missing)
+        return cached
+
+    # Drop cached predictions, e.g. after a model or the context tables change
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def cache_info(self):
+        return self.hits, self.misses
+
+
+def table_paths(data_dir=FIXTURE_DATA_DIR):
+    return [os.path.join(data_dir, filename) for filename, _ in LEAGUES.values()]
+
+
+def load(data_dir=FIXTURE_DATA_DIR):
+    tables = {}
+    for league, (filename, cutoff) in LEAGUES.items():
+        path = os.path.join(data_dir, filename)
+        # Leagues without an ingested table simply have no fixtures to serve
+        if os.path.exists(path):
+            tables[league] = assemble(pd.read_csv(path), cutoff)
+    return FixtureContext(tables)
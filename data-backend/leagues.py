@@ -0,0 +1,185 @@
+# leagues.py
+#
+# League registry for the match outcome models. Each entry of LEAGUES_CONFIG
+# (leagues.json) gets, without any per-league code:
+#   - /predict, /predict/batch and /explain matchoutcome routes and a request
+#     schema in main.py, named <key>_outcomemodel / <key>outcomedata as before
+#   - its fixture context table and kickoff cutoff (fixture_context.py)
+#   - team vocabulary, crests, banner and slider ranges in the frontend, which
+#     reads the same file
+# Adding a league is a config entry plus its model files.
+#
+# Outcome models are loaded on first use into an LRU cache bounded by
+# LEAGUE_MODEL_BUDGET_MB, with the size of the model files on disk as the
+# estimate of what a league keeps resident. The least recently used leagues are
+# dropped when a load goes over budget (the league just loaded always stays).
+# A league being read from disk only holds up requests for that league.
+# Leagues with "preload": true are loaded at startup with the other models.
+# Upcoming-round snapshots cover leagues with "snapshot": true (by default the
+# preloaded ones); a build uses the cached model when the league is resident and
+# otherwise loads one just for the build, outside the cache and its budget.
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import time
+
+import metrics
+
+
+LEAGUES_CONFIG = os.getenv("LEAGUES_CONFIG", "leagues.json")
+MODEL_BUDGET_MB = float(os.getenv("LEAGUE_MODEL_BUDGET_MB", "512"))
+
+# Outcome model inputs, in wrapper argument order
+OUTCOME_FIELDS = {
+    "position_away": float,
+    "position_home": float,
+    "match_temperature": float,
+    "wind_speed": float,
+    "humidity": float,
+    "pressure": float,
+    "clouds": float,
+    "team_name_home": str,
+    "team_name_away": str,
+    "time_of_day": str,
+}
+OUTCOME_COLUMNS = list(OUTCOME_FIELDS)
+
+
+class League:
+    def __init__(self, key, config):
+        self.key = key
+        self.name = config["name"]
+        self.short_name = config.get("short_name", self.name)
+        self.model_file = config["model"]
+        self.fast_model_file = config.get("fast_model", self.model_file.replace("_rf.pkl", "_fast.pkl"))
+        self.context_table = config.get("context_table")
+        # Latest kickoff counted as "earlier" for time_of_day
+        self.kickoff_cutoff = time.fromisoformat(config.get("kickoff_cutoff", "15:00"))
+        self.preload = config.get("preload", False)
+        self.snapshot = config.get("snapshot", self.preload)
+        self.teams = config.get("teams", [])
+        self.crest_dir = config.get("crest_dir")
+        self.wrapper_name = f"{key}_outcomemodel"
+
+    def crest_path(self, team):
+        return f"{self.crest_dir}/{team}.jpg" if self.crest_dir else None
+
+    def describe(self):
+        return {
+            "league": self.key,
+            "name": self.name,
+            "short_name": self.short_name,
+            "model": self.wrapper_name,
+            "kickoff_cutoff": self.kickoff_cutoff.strftime("%H:%M"),
+            "routes": {
+                "predict": f"/predict/matchoutcome/{self.key}",
+                "batch": f"/predict/batch/matchoutcome/{self.key}",
+                "explain": f"/explain/matchoutcome/{self.key}",
+                "round": f"/predict/round/{self.key}/{{round_id}}",
+                "upcoming": f"/predict/upcoming/{self.key}",
+            },
+            "teams": [{"name": team, "crest": self.crest_path(team)} for team in self.teams],
+        }
+
+
+def load(path=LEAGUES_CONFIG):
+    with open(path, encoding="utf-8") as f:
+        return {key: League(key, config) for key, config in json.load(f).items()}
+
+
+registry = load()
+
+
+def _path_bytes(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+# LRU of loaded league models, bounded by an estimate of their resident size.
+# load_fn(key) returns the value to cache, paths_fn(key) the files it was read from.
+class ModelCache:
+    def __init__(self, load_fn, paths_fn, budget_mb=MODEL_BUDGET_MB, on_evict=None):
+        self.load_fn = load_fn
+        self.paths_fn = paths_fn
+        self.budget_bytes = budget_mb * 1024 * 1024
+        self.on_evict = on_evict
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Per-league locks of loads in progress
+        self._loading = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _hit(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def get(self, key):
+        with self._lock:
+            entry = self._hit(key)
+            if entry is not None:
+                return entry[0]
+            key_lock = self._loading.setdefault(key, threading.Lock())
+        # Concurrent first requests for a league load it once; the cache lock is
+        # only held for bookkeeping, so other leagues keep answering meanwhile
+        with key_lock:
+            with self._lock:
+                entry = self._hit(key)
+                if entry is not None:
+                    return entry[0]
+                self.misses += 1
+            try:
+                value = self.load_fn(key)
+                size = sum(_path_bytes(path) for path in self.paths_fn(key))
+                with self._lock:
+                    self._entries[key] = (value, size)
+                    while self.resident_bytes() > self.budget_bytes and len(self._entries) > 1:
+                        self._evict(next(iter(self._entries)))
+                    metrics.set_gauge("league_models_resident_bytes", self.resident_bytes())
+            finally:
+                with self._lock:
+                    self._loading.pop(key, None)
+            return value
+
+    # Cached value without loading it or touching the LRU order; None when not resident
+    def peek(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return None if entry is None else entry[0]
+
+    # Forget a league, e.g. when its model file changed; the next get() reloads it
+    def discard(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._evict(key, count=False)
+
+    def _evict(self, key, count=True):
+        del self._entries[key]
+        if count:
+            self.evictions += 1
+            metrics.inc("league_model_evictions_total", league=key)
+        if self.on_evict is not None:
+            self.on_evict(key)
+
+    def resident_bytes(self):
+        return sum(size for _, size in self._entries.values())
+
+    def cache_info(self):
+        return self.hits, self.misses
+
+    def report(self):
+        with self._lock:
+            return {
+                "budget_bytes": self.budget_bytes,
+                "resident_bytes": self.resident_bytes(),
+                "loaded": list(self._entries),
+                "evictions": self.evictions,
+            }
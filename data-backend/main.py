@@ -1,14 +1,59 @@
-from fastapi import FastAPI, Query
-from pydantic import BaseModel, Field
-from typing import Optional
-import joblib
-import pandas as pd
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+from pydantic import Field, create_model
+from typing import Literal, Optional
+from contextlib import asynccontextmanager
+from datetime import datetime
+import asyncio
+import logging
+import os
+import time
 from fastapi.middleware.cors import CORSMiddleware
 
 
+import leagues
+import metrics
+import profiling
+import snapshots
+import startup
+from metrics import TimedModel
 from preprocessing_utils import clean_categories
-
-app = FastAPI()
+from startup import lazy_import
+
+# Imported on first use, so STARTUP_MODE=background can open the port before loading them
+joblib = lazy_import("joblib")
+pd = lazy_import("pandas")
+columnar = lazy_import("columnar")
+drift = lazy_import("drift")
+explain = lazy_import("explain")
+fixture_context = lazy_import("fixture_context")
+shot_store = lazy_import("shot_store")
+
+logger = logging.getLogger(__name__)
+
+# Background tasks that live as long as the server
+@asynccontextmanager
+async def lifespan(app):
+    background = asyncio.create_task(run_background_tasks())
+    yield
+    background.cancel()
+
+async def run_background_tasks():
+    if not startup.warmup.ready:
+        try:
+            await asyncio.to_thread(startup.warmup.run, load_models)
+        except Exception:
+            # Recorded in startup.warmup, so /health reports "error"; the loops
+            # below still start and log their own failures while models are missing
+            logger.exception("model warm-up failed")
+    await asyncio.gather(snapshots.run_periodically("source reload", reload_changed_sources),
+                         upcoming_snapshots.run(), drift.monitor.run())
+
+app = FastAPI(default_response_class=metrics.TimedJSONResponse, lifespan=lifespan)
+
+if startup.MODE == "background":
+    app.add_middleware(startup.WarmupGate)
 
 app.add_middleware(
     CORSMiddleware,
@@ -18,107 +63,443 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Model label for each prediction route, used by the metrics middleware
+# (league routes are added by add_league_routes)
+MODEL_ROUTES = {
+    "/predict/goals/epl": "epl_goalsmodel",
+    "/predict/goals/messi": "messi_goalsmodel",
+    "/predict/batch/goals/epl": "epl_goalsmodel",
+    "/predict/batch/goals/messi": "messi_goalsmodel",
+    "/explain/goals/epl": "epl_goalsmodel",
+    "/explain/goals/messi": "messi_goalsmodel",
+    "/explain/batch/goals/epl": "epl_goalsmodel",
+    "/explain/batch/goals/messi": "messi_goalsmodel",
+}
+
+# Wrapper name -> (wrapper taking the model inputs in column order, accurate model getter), for the benchmarks
+WRAPPERS = {}
+
+if metrics.ENABLED:
+    @app.middleware("http")
+    async def record_request_metrics(request: Request, call_next):
+        model = MODEL_ROUTES.get(request.url.path, "none")
+        if request.query_params.get("model_tier") == "fast":
+            model += "_fast"
+        token = metrics.current_model.set(model)
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.current_model.reset(token)
+            # Use the route template (not the raw path) to keep label cardinality bounded
+            route = request.scope.get("route")
+            route = route.path if route is not None else "unmatched"
+            metrics.inc("http_requests_total", route=route, method=request.method, status=status, model=model)
+            metrics.observe("http_request_duration_seconds", elapsed, route=route, model=model)
+
+    @app.get("/metrics")
+    def get_metrics():
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+# Opt-in profiles of slow/sampled requests (see profiling.py)
+if profiling.ENABLED:
+    @app.get("/debug/profiles")
+    def get_profiles():
+        return {"profiles": profiling.list_profiles()}
+
+    @app.get("/debug/profiles/{profile_id}")
+    def get_profile(profile_id: str):
+        folded = profiling.read_profile(profile_id)
+        if folded is None:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        return PlainTextResponse(folded)
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the Football Prediction API!"}
 
 @app.get("/health")
 def health_check():
-    return {"status": "ok"}
+    status = startup.warmup.status()
+    if status == "error":
+        raise HTTPException(status_code=503, detail={"status": status, "startup": startup.warmup.report()})
+    return {"status": status, "startup": startup.warmup.report()}
+
+# Latest drift and throughput report; refresh=true computes it now instead of
+# waiting for the background task
+@app.get("/monitoring/drift")
+def drift_report(refresh: bool = False):
+    return drift.monitor.compute() if refresh else drift.monitor.report
 
 @app.get("/models")
 def get_models():
     return {
         "models": [
-            {"name": "epl_goalsmodel", "description": "Predicts goal likelihood in EPL matches"},
-            {"name": "messi_goalsmodel", "description": "Predicts goal likelihood for Messi"},
-            {"name": "epl_outcomemodel", "description": "Predicts EPL match outcomes"}
+            {"name": "epl_goalsmodel", "description": "Predicts goal likelihood in EPL matches", "tiers": available_tiers(model_epl_fast)},
+            {"name": "messi_goalsmodel", "description": "Predicts goal likelihood for Messi", "tiers": available_tiers(model_messi_fast)},
+        ] + [
+            # Fast tier from the file, so listing does not load evicted leagues
+            {"name": league.wrapper_name, "description": f"Predicts {league.short_name} match outcomes",
+             "tiers": ["accurate", "fast"] if os.path.exists(league.fast_model_file) else ["accurate"]}
+            for league in leagues.registry.values()
         ]
     }
 
-# Load model for EPL matches
-model_eplmatches = joblib.load("eplmatches5ymodel_rf.pkl")
-
-# Pydantic model
-class eploutcomedata(BaseModel):
-    position_away: float
-    position_home: float
-    match_temperature: float
-    wind_speed: float	
-    humidity: float
-    pressure: float
-    clouds: float
-    team_name_home: str
-    team_name_away: str
-    time_of_day: str
+# Registered leagues with their routes, team vocabularies and crests, and which
+# league models are resident
+@app.get("/leagues")
+def get_leagues():
+    return {"leagues": [league.describe() for league in leagues.registry.values()], "models": league_models.report()}
+
+# Model tiers: "accurate" is the RandomForest pipeline, "fast" the calibrated
+# lightweight model from train_fast_models.py (selected with ?model_tier=fast)
+ModelTier = Literal["fast", "accurate"]
+
+# Engine for the accurate tier: "sklearn" runs the pickled pipeline, "onnx" the
+# graph written by export_onnx.py on onnxruntime (see onnx_engine.py), "shared"
+# the memory-mapped forests built by shared_models.py, shared by all workers
+INFERENCE_ENGINE = os.getenv("INFERENCE_ENGINE", "sklearn")
+if INFERENCE_ENGINE not in ("sklearn", "onnx", "shared"):
+    raise ValueError(f"INFERENCE_ENGINE must be 'sklearn', 'onnx' or 'shared', got {INFERENCE_ENGINE!r}")
+
+# File (or model store directory) the accurate tier is actually loaded from
+def accurate_model_path(path):
+    if INFERENCE_ENGINE == "onnx":
+        return path.replace(".pkl", ".onnx")
+    if INFERENCE_ENGINE == "shared":
+        import shared_models
+        return shared_models.store_path(path)
+    return path
+
+def load_accurate_model(name, path):
+    if INFERENCE_ENGINE == "onnx":
+        import onnx_engine
+        return metrics.load_model(name, accurate_model_path(path), loader=onnx_engine.load)
+    if INFERENCE_ENGINE == "shared":
+        import shared_models
+        return metrics.load_model(name, accurate_model_path(path), loader=shared_models.load)
+    return metrics.load_model(name, path)
+
+def load_fast_model(name, path):
+    # Fast tiers are optional; routes answer 404 for model_tier=fast until one is trained
+    if not os.path.exists(path):
+        return None
+    return metrics.load_model(name + "_fast", path)
+
+def pick_model(accurate, fast, model_tier):
+    if model_tier == "fast":
+        if fast is None:
+            raise HTTPException(status_code=404, detail="No fast model available for this route")
+        return fast
+    return accurate
+
+def available_tiers(fast):
+    return ["accurate", "fast"] if fast is not None else ["accurate"]
+
+# Column-oriented batch prediction behind the /predict/batch routes (see columnar.py)
+async def run_batch(request, schema, name, accurate, fast, model_tier):
+    model = pick_model(accurate, fast, model_tier)
+    media_type = columnar.negotiate(request.headers.get("accept"))
+    body = await request.body()
+    return await run_in_threadpool(batch_predict, body, request.headers.get("content-type"), schema, name, model, model_tier, media_type)
+
+def batch_predict(body, content_type, schema, name, model, model_tier, media_type):
+    with metrics.stage("parse"):
+        df = columnar.build_frame(schema, columnar.decode_columns(body, content_type))
+    with metrics.stage("predict_proba"):
+        predictions = model.predict_proba(df)[:, 1]
+    drift.monitor.record_frame(name, df, predictions if model_tier == "accurate" else None)
+    with metrics.stage("serialize"):
+        return columnar.encode_predictions(predictions, model_tier, media_type)
+
+# Per-feature contributions of the accurate RandomForest (see explain.py), behind
+# the /explain routes. Explainers are built on first use from the loaded pipeline,
+# from the memory-mapped arrays under INFERENCE_ENGINE=shared, or from the
+# pickle under INFERENCE_ENGINE=onnx (the graph does not expose its trees).
+explainers = {}
+
+def explanation_cache_info():
+    infos = [explainer.cache_info() for _, explainer in explainers.values()]
+    return sum(hits for hits, _ in infos), sum(misses for _, misses in infos)
+
+metrics.register_cache("explanations", explanation_cache_info)
+
+def get_explainer(name, model, path):
+    entry = explainers.get(name)
+    if entry is None or entry[0] is not model:
+        if INFERENCE_ENGINE == "shared":
+            explainer = explain.ForestExplainer.from_shared(model)
+        else:
+            explainer = explain.ForestExplainer(model if INFERENCE_ENGINE == "sklearn" else joblib.load(path))
+        entry = explainers[name] = (model, explainer)
+    return entry[1]
+
+def explain_rows(explainer, df):
+    with metrics.stage("clean_categories"):
+        df = clean_categories(df)
+    with metrics.stage("explain"):
+        return explainer.explain(df)
+
+def explain_one(explainer, data):
+    with metrics.stage("dataframe"):
+        df = pd.DataFrame([data.model_dump()])
+    return {**explain_rows(explainer, df)[0], "model_tier": "accurate"}
+
+async def run_explain_batch(request, schema, name, model, path):
+    body = await request.body()
+    return await run_in_threadpool(explain_batch, body, request.headers.get("content-type"), schema, name, model, path)
+
+def explain_batch(body, content_type, schema, name, model, path):
+    explainer = get_explainer(name, model, path)
+    with metrics.stage("parse"):
+        df = columnar.build_frame(schema, columnar.decode_columns(body, content_type))
+    with metrics.stage("explain"):
+        return {"explanations": explainer.explain(df), "model_tier": "accurate"}
+
+# Models and data stores, loaded at import (STARTUP_MODE=eager) or by the
+# background warm-up task (STARTUP_MODE=background, see startup.py)
+def load_models():
+    global model_epl, model_epl_fast, model_messi, model_messi_fast, fixture_store, shot_stores
+    # League outcome models marked "preload"; the others load on first use
+    for key, league in leagues.registry.items():
+        if league.preload:
+            league_models.get(key)
+
+    # Load model for EPL goals
+    model_epl = load_accurate_model("epl_goalsmodel", "eplgoalsmodel_rf.pkl")
+    model_epl_fast = load_fast_model("epl_goalsmodel", "eplgoalsmodel_fast.pkl")
+
+    # Load model for Messi goals
+    model_messi = load_accurate_model("messi_goalsmodel", "messigoalsmodel_rf.pkl")
+    model_messi_fast = load_fast_model("messi_goalsmodel", "messigoalsmodel_fast.pkl")
+
+    # Fixture context and shot stores
+    fixture_store = fixture_context.load()
+    metrics.register_cache("fixture_predictions", lambda: fixture_store.cache_info())
+    loaded_sources["context"] = snapshots.file_versions(fixture_context.table_paths())
+
+    shot_stores = shot_store.load_all()
+
+    # Live input sampling for the drift monitor (see drift.py); leagues register as they load
+    drift.monitor.register("epl_goalsmodel", eplgoaldata.model_fields, model_epl)
+    drift.monitor.register("messi_goalsmodel", messigoaldata.model_fields, model_messi)
+
+# Match outcome models, one per league in the registry (see leagues.py). Models
+# are loaded on first use and kept within LEAGUE_MODEL_BUDGET_MB by an LRU.
+def load_league_models(key):
+    league = leagues.registry[key]
+    accurate = load_accurate_model(league.wrapper_name, league.model_file)
+    fast = load_fast_model(league.wrapper_name, league.fast_model_file)
+    loaded_sources[key] = snapshots.file_versions(league_model_paths(key))
+    drift.monitor.register(league.wrapper_name, leagues.OUTCOME_COLUMNS, accurate)
+    return accurate, fast
+
+def league_model_paths(key):
+    league = leagues.registry[key]
+    return [accurate_model_path(league.model_file), league.fast_model_file]
+
+league_models = leagues.ModelCache(load_league_models, league_model_paths,
+                                   on_evict=lambda key: explainers.pop(leagues.registry[key].wrapper_name, None))
+metrics.register_cache("league_models", league_models.cache_info)
+
+# (accurate, fast) outcome models of a league, loading them if needed
+def outcome_models(league):
+    return league_models.get(league)
+
+# Pydantic model of a league's request body; team fields list the league's vocabulary as examples
+def outcome_schema(league):
+    fields = {column: (kind, ...) for column, kind in leagues.OUTCOME_FIELDS.items()}
+    for column in ("team_name_home", "team_name_away"):
+        fields[column] = (str, Field(..., examples=league.teams))
+    return create_model(f"{league.key}outcomedata", __base__=TimedModel, **fields)
 
 # Model wrapper
-def epl_outcomemodel(position_away, position_home, match_temperature, wind_speed, humidity, pressure, clouds, team_name_home, team_name_away, time_of_day):
+def outcome_model(league, features, model_tier="accurate"):
+    with metrics.stage("dataframe"):
+        df = pd.DataFrame([features], columns=leagues.OUTCOME_COLUMNS)
+    with metrics.stage("clean_categories"):
+        df=clean_categories(df)
+
+    with metrics.stage("predict_proba"):
+        prediction = pick_model(*outcome_models(league), model_tier).predict_proba(df)[0][1]
+    drift.monitor.record(leagues.registry[league].wrapper_name, features, prediction if model_tier == "accurate" else None)
+    return prediction
 
-    columns = ['position_away', 'position_home', 'match_temperature', 'wind_speed', 'humidity', 'pressure', 'clouds', 'team_name_home', 'team_name_away', 'time_of_day']
-    features = [position_away, position_home, match_temperature, wind_speed, humidity, pressure, clouds, team_name_home, team_name_away, time_of_day]
+# Prediction, batch and explanation routes for one league's match outcomes
+def add_league_routes(league):
+    key, name, schema = league.key, league.wrapper_name, outcome_schema(league)
 
-    df = pd.DataFrame([features], columns=columns)
-    df=clean_categories(df)
-    
-    prediction = model_eplmatches.predict_proba(df)[0][1]
-    return prediction
+    def predict(data: schema, model_tier: ModelTier = "accurate"):
+        prediction = outcome_model(key, [getattr(data, column) for column in leagues.OUTCOME_COLUMNS], model_tier=model_tier)
 
-# Prediction route for EPL match outcomes
-@app.post("/predict/matchoutcome/epl")
-def predict_eplmatchoutcome(data: eploutcomedata):
-    prediction = epl_outcomemodel(data.position_away, data.position_home, data.match_temperature, data.wind_speed, data.humidity, data.pressure, data.clouds, data.team_name_home, data.team_name_away, data.time_of_day)
-    
-    return {"prediction": prediction}
+        return {"prediction": prediction, "model_tier": model_tier}
 
+    # Model lookups may load the league, so they run in the threadpool
+    async def predict_batch(request: Request, model_tier: ModelTier = "accurate"):
+        accurate, fast = await run_in_threadpool(outcome_models, key)
+        return await run_batch(request, schema, name, accurate, fast, model_tier)
 
+    def explain_route(data: schema):
+        return explain_one(get_explainer(name, outcome_models(key)[0], league.model_file), data)
 
+    async def explain_batch_route(request: Request):
+        accurate, _ = await run_in_threadpool(outcome_models, key)
+        return await run_explain_batch(request, schema, name, accurate, league.model_file)
 
+    routes = {
+        f"/predict/matchoutcome/{key}": (predict, f"predict_{key}matchoutcome", True),
+        f"/predict/batch/matchoutcome/{key}": (predict_batch, f"predict_{key}matchoutcome_batch", False),
+        f"/explain/matchoutcome/{key}": (explain_route, f"explain_{key}matchoutcome", True),
+        f"/explain/batch/matchoutcome/{key}": (explain_batch_route, f"explain_{key}matchoutcome_batch", False),
+    }
+    for path, (endpoint, endpoint_name, profiled) in routes.items():
+        endpoint.__name__ = endpoint_name
+        app.post(path)(profiling.profiled(endpoint) if profiled else endpoint)
+        MODEL_ROUTES[path] = name
 
-# Load model for La Liga matches
-model_laligamatches = joblib.load("laligamatches5ymodel_rf.pkl")
+    WRAPPERS[name] = (lambda *features, model_tier="accurate": outcome_model(key, list(features), model_tier), lambda: outcome_models(key)[0])
 
-# Pydantic model
-class laligaoutcomedata(BaseModel):
-    position_away: float
-    position_home: float
-    match_temperature: float
-    wind_speed: float	
-    humidity: float
-    pressure: float
-    clouds: float
-    team_name_home: str
-    team_name_away: str
-    time_of_day: str
+for league in leagues.registry.values():
+    add_league_routes(league)
 
-# Model wrapper
-def laliga_outcomemodel(position_away, position_home, match_temperature, wind_speed, humidity, pressure, clouds, team_name_home, team_name_away, time_of_day):
+LeagueKey = Literal[tuple(leagues.registry)]
 
-    columns = ['position_away', 'position_home', 'match_temperature', 'wind_speed', 'humidity', 'pressure', 'clouds', 'team_name_home', 'team_name_away', 'time_of_day']
-    features = [position_away, position_home, match_temperature, wind_speed, humidity, pressure, clouds, team_name_home, team_name_away, time_of_day]
 
-    df = pd.DataFrame([features], columns=columns)
-    df=clean_categories(df)
-    
-    prediction = model_laligamatches.predict_proba(df)[0][1]
-    return prediction
 
-# Prediction route for EPL match outcomes
-@app.post("/predict/matchoutcome/laliga")
-def predict_laligamatchoutcome(data: laligaoutcomedata):
-    prediction = laliga_outcomemodel(data.position_away, data.position_home, data.match_temperature, data.wind_speed, data.humidity, data.pressure, data.clouds, data.team_name_home, data.team_name_away, data.time_of_day)
-    
-    return {"prediction": prediction}
+# Match outcomes for ingested fixtures, with standings and weather looked up
+# from the fixture context store (see fixture_context.py)
+
+# Prediction route for a single fixture
+@app.get("/predict/fixture/{fixture_id}")
+@profiling.profiled
+def predict_fixture(fixture_id: int, model_tier: ModelTier = "accurate"):
+    fixture = fixture_store.fixture(fixture_id)
+    if fixture is None:
+        raise HTTPException(status_code=404, detail="Fixture not found")
+    model = pick_model(*outcome_models(fixture["league"]), model_tier)
+    with metrics.stage("predict_proba"):
+        prediction = fixture_store.predict([fixture], model, model_tier)[0]
+
+    return {**fixture_summary(fixture), "features": fixture_store.feature_row(fixture), "prediction": prediction, "model_tier": model_tier}
+
+# Prediction route for every fixture of a round, scored in one model call
+@app.get("/predict/round/{league}/{round_id}")
+@profiling.profiled
+def predict_round(league: LeagueKey, round_id: int, model_tier: ModelTier = "accurate"):
+    fixtures = fixture_store.round(league, round_id)
+    if not fixtures:
+        raise HTTPException(status_code=404, detail="Round not found")
+    model = pick_model(*outcome_models(league), model_tier)
+    with metrics.stage("predict_proba"):
+        predictions = fixture_store.predict(fixtures, model, model_tier)
+
+    return {
+        "league": league,
+        "round_id": round_id,
+        "model_tier": model_tier,
+        "fixtures": [{**fixture_summary(fixture), "prediction": prediction} for fixture, prediction in zip(fixtures, predictions)],
+    }
 
+# Explanation route for a single fixture
+@app.get("/explain/fixture/{fixture_id}")
+@profiling.profiled
+def explain_fixture(fixture_id: int):
+    fixture = fixture_store.fixture(fixture_id)
+    if fixture is None:
+        raise HTTPException(status_code=404, detail="Fixture not found")
+    league = leagues.registry[fixture["league"]]
+    explainer = get_explainer(league.wrapper_name, outcome_models(league.key)[0], league.model_file)
+    row = fixture_store.features[fixture["league"]].iloc[[fixture["row"]]]
+    with metrics.stage("explain"):
+        explanation = explainer.explain(row)[0]
+
+    return {**fixture_summary(fixture), **explanation, "model_tier": "accurate"}
+
+def fixture_summary(fixture):
+    return {key: fixture[key] for key in ("fixture_id", "fixture_name", "league", "round_id", "starting_at")}
+
+# Win probabilities for the next SNAPSHOT_ROUNDS rounds of every league marked
+# "snapshot" in the registry, kept as a prebuilt snapshot by a background task
+# (see snapshots.py). SNAPSHOT_AS_OF pins "now" (e.g. 2024-01-01) when serving
+# historical fixture tables.
+SNAPSHOT_ROUNDS = int(os.getenv("SNAPSHOT_ROUNDS", "3"))
+SNAPSHOT_AS_OF = os.getenv("SNAPSHOT_AS_OF")
+
+# Source -> file versions the loaded context tables and models were read from
+loaded_sources = {}
+
+# Reloads context tables whose files changed since they were loaded, and drops
+# outcome models whose files (accurate or fast tier) changed so their next use
+# loads the new version
+def reload_changed_sources():
+    global fixture_store
+    context = snapshots.file_versions(fixture_context.table_paths())
+    if context != loaded_sources["context"]:
+        fixture_store = fixture_context.load()
+        loaded_sources["context"] = context
+    for key, league in leagues.registry.items():
+        version = snapshots.file_versions(league_model_paths(key))
+        if version != loaded_sources.get(key, version):
+            league_models.discard(key)
+            fixture_store.clear()
+        loaded_sources[key] = version
+
+def snapshot_now():
+    return datetime.fromisoformat(SNAPSHOT_AS_OF) if SNAPSHOT_AS_OF else None
+
+def snapshot_leagues():
+    return [key for key, league in leagues.registry.items() if league.snapshot]
+
+# Changes whenever a loaded model or context table changes (reload_changed_sources
+# runs on its own), or a round moves into the window; reads only
+def upcoming_version():
+    rounds = tuple((league, tuple(fixture_store.upcoming_rounds(league, SNAPSHOT_ROUNDS, snapshot_now()))) for league in snapshot_leagues())
+    return tuple(sorted(loaded_sources.items())), rounds
+
+# Accurate model for a snapshot build: the cached one when the league is resident,
+# else one loaded for this build only, so builds never evict models live traffic
+# uses or push the league cache over its budget
+def snapshot_model(key):
+    resident = league_models.peek(key)
+    if resident is not None:
+        return resident[0]
+    league = leagues.registry[key]
+    return load_accurate_model(league.wrapper_name, league.model_file)
+
+def build_upcoming_snapshot():
+    store = fixture_store
+    contents = {}
+    for league in snapshot_leagues():
+        round_ids = store.upcoming_rounds(league, SNAPSHOT_ROUNDS, snapshot_now())
+        model = snapshot_model(league) if round_ids else None
+        rounds = []
+        for round_id in round_ids:
+            fixtures = store.round(league, round_id)
+            predictions = store.predict(fixtures, model, "accurate")
+            rounds.append({
+                "round_id": round_id,
+                "fixtures": [{**fixture_summary(fixture), "prediction": prediction} for fixture, prediction in zip(fixtures, predictions)],
+            })
+        contents[league] = {"league": league, "model_tier": "accurate", "rounds": rounds}
+    return contents
+
+upcoming_snapshots = snapshots.SnapshotScheduler("upcoming", upcoming_version, build_upcoming_snapshot)
+
+# Snapshot read route: prebuilt JSON with ETag/Cache-Control, no model work
+@app.get("/predict/upcoming/{league}")
+async def predict_upcoming(league: LeagueKey, request: Request):
+    return upcoming_snapshots.response(league, request.headers.get("if-none-match"))
 
 
 
 
-# Load model for EPL goals
-model_epl = joblib.load("eplgoalsmodel_rf.pkl")
 
 # Pydantic model
-class eplgoaldata(BaseModel):
+class eplgoaldata(TimedModel):
     match_period: int
     minute_in_half: int	
     possession_team: str
@@ -128,33 +509,52 @@ class eplgoaldata(BaseModel):
     y: float
 
 # Model wrapper
-def epl_goalsmodel(match_period, minute_in_half, possession_team, play_pattern, position, x,y):
+def epl_goalsmodel(match_period, minute_in_half, possession_team, play_pattern, position, x,y, model_tier="accurate"):
 
     columns = ['match_period', 'minute_in_half', 'possession_team', 'play_pattern', 'position','x','y']
     features = [match_period, minute_in_half, possession_team, play_pattern, position, x, y]
 
-    df = pd.DataFrame([features], columns=columns)
-    df=clean_categories(df)
+    with metrics.stage("dataframe"):
+        df = pd.DataFrame([features], columns=columns)
+    with metrics.stage("clean_categories"):
+        df=clean_categories(df)
     
-    prediction = model_epl.predict_proba(df)[0][1]
+    with metrics.stage("predict_proba"):
+        prediction = pick_model(model_epl, model_epl_fast, model_tier).predict_proba(df)[0][1]
+    drift.monitor.record("epl_goalsmodel", features, prediction if model_tier == "accurate" else None)
     return prediction
 
+WRAPPERS["epl_goalsmodel"] = (epl_goalsmodel, lambda: model_epl)
+
 # Prediction route for EPL goals
 @app.post("/predict/goals/epl")
-def predict_eplgoals(data: eplgoaldata):
-    prediction = epl_goalsmodel(data.match_period, data.minute_in_half, data.possession_team, data.play_pattern, data.position, data.x, data.y)
+@profiling.profiled
+def predict_eplgoals(data: eplgoaldata, model_tier: ModelTier = "accurate"):
+    prediction = epl_goalsmodel(data.match_period, data.minute_in_half, data.possession_team, data.play_pattern, data.position, data.x, data.y, model_tier=model_tier)
     
-    return {"prediction": prediction}
+    return {"prediction": prediction, "model_tier": model_tier}
 
+# Column-oriented batch route for EPL goals
+@app.post("/predict/batch/goals/epl")
+async def predict_eplgoals_batch(request: Request, model_tier: ModelTier = "accurate"):
+    return await run_batch(request, eplgoaldata, "epl_goalsmodel", model_epl, model_epl_fast, model_tier)
+
+# Explanation routes for EPL goals
+@app.post("/explain/goals/epl")
+@profiling.profiled
+def explain_eplgoals(data: eplgoaldata):
+    return explain_one(get_explainer("epl_goalsmodel", model_epl, "eplgoalsmodel_rf.pkl"), data)
+
+@app.post("/explain/batch/goals/epl")
+async def explain_eplgoals_batch(request: Request):
+    return await run_explain_batch(request, eplgoaldata, "epl_goalsmodel", model_epl, "eplgoalsmodel_rf.pkl")
 
 
 
 
-# Load model for Messi goals
-model_messi = joblib.load("messigoalsmodel_rf.pkl")
 
 # Pydantic model
-class messigoaldata(BaseModel):
+class messigoaldata(TimedModel):
     match_period: int
     minute_in_half: int		
     play_pattern: str
@@ -163,20 +563,86 @@ class messigoaldata(BaseModel):
     y: float
 
 # Model wrapper
-def messi_goalsmodel(match_period, minute_in_half, play_pattern, under_pressure, x,y):
+def messi_goalsmodel(match_period, minute_in_half, play_pattern, under_pressure, x,y, model_tier="accurate"):
 
     columns = ['match_period', 'minute_in_half', 'play_pattern', 'under_pressure','x','y']
     features = [match_period, minute_in_half, play_pattern, under_pressure, x, y]
 
-    df = pd.DataFrame([features], columns=columns)
-    df=clean_categories(df)
+    with metrics.stage("dataframe"):
+        df = pd.DataFrame([features], columns=columns)
+    with metrics.stage("clean_categories"):
+        df=clean_categories(df)
     
-    prediction = model_messi.predict_proba(df)[0][1]
+    with metrics.stage("predict_proba"):
+        prediction = pick_model(model_messi, model_messi_fast, model_tier).predict_proba(df)[0][1]
+    drift.monitor.record("messi_goalsmodel", features, prediction if model_tier == "accurate" else None)
     return prediction
 
+WRAPPERS["messi_goalsmodel"] = (messi_goalsmodel, lambda: model_messi)
+
 # Prediction route for Messi goals
 @app.post("/predict/goals/messi")
-def predict_messigoals(data: messigoaldata):
-    prediction = messi_goalsmodel(data.match_period, data.minute_in_half, data.play_pattern, data.under_pressure, data.x, data.y)
+@profiling.profiled
+def predict_messigoals(data: messigoaldata, model_tier: ModelTier = "accurate"):
+    prediction = messi_goalsmodel(data.match_period, data.minute_in_half, data.play_pattern, data.under_pressure, data.x, data.y, model_tier=model_tier)
     
-    return {"prediction": prediction}
\ No newline at end of file
+    return {"prediction": prediction, "model_tier": model_tier}
+
+# Column-oriented batch route for Messi goals
+@app.post("/predict/batch/goals/messi")
+async def predict_messigoals_batch(request: Request, model_tier: ModelTier = "accurate"):
+    return await run_batch(request, messigoaldata, "messi_goalsmodel", model_messi, model_messi_fast, model_tier)
+
+# Explanation routes for Messi goals
+@app.post("/explain/goals/messi")
+@profiling.profiled
+def explain_messigoals(data: messigoaldata):
+    return explain_one(get_explainer("messi_goalsmodel", model_messi, "messigoalsmodel_rf.pkl"), data)
+
+@app.post("/explain/batch/goals/messi")
+async def explain_messigoals_batch(request: Request):
+    return await run_explain_batch(request, messigoaldata, "messi_goalsmodel", model_messi, "messigoalsmodel_rf.pkl")
+
+
+
+
+
+# Historical StatsBomb shots with spatial and categorical indexes (see shot_store.py)
+def get_shot_store(dataset):
+    store = shot_stores.get(dataset)
+    if store is None:
+        raise HTTPException(status_code=404, detail="Shot store not built for this dataset")
+    return store
+
+def query_shot_rows(store, team, play_pattern, period, under_pressure, x, y, radius):
+    near = None
+    if radius is not None:
+        if x is None or y is None:
+            raise HTTPException(status_code=422, detail="radius needs both x and y")
+        near = (x, y, radius)
+    with metrics.stage("query"):
+        return store.query(team=team, play_pattern=play_pattern, period=period, under_pressure=under_pressure, near=near)
+
+# Shot counts, goals and model xG for a filter, e.g. ?team=Arsenal&play_pattern=From Corner&x=105&y=40&radius=10
+@app.get("/shots/{dataset}")
+def get_shots(dataset: Literal["epl", "messi"], team: Optional[str] = None, play_pattern: Optional[str] = None,
+              period: Optional[int] = None, under_pressure: Optional[bool] = None, x: Optional[float] = None,
+              y: Optional[float] = None, radius: Optional[float] = Query(None, gt=0), limit: int = Query(0, ge=0, le=1000)):
+    store = get_shot_store(dataset)
+    rows = query_shot_rows(store, team, play_pattern, period, under_pressure, x, y, radius)
+    result = {"dataset": dataset, **store.summary(rows)}
+    if limit:
+        result["rows"] = store.shots(rows[:limit])
+    return result
+
+# Conversion rate and model xG per bin_size x bin_size square, for the same filters
+@app.get("/shots/{dataset}/map")
+def get_shot_map(dataset: Literal["epl", "messi"], bin_size: float = Query(10.0, ge=1, le=40), team: Optional[str] = None,
+                 play_pattern: Optional[str] = None, period: Optional[int] = None, under_pressure: Optional[bool] = None,
+                 x: Optional[float] = None, y: Optional[float] = None, radius: Optional[float] = Query(None, gt=0)):
+    store = get_shot_store(dataset)
+    rows = query_shot_rows(store, team, play_pattern, period, under_pressure, x, y, radius)
+    return {"dataset": dataset, **store.summary(rows), "bins": store.conversion_map(rows, bin_size)}
+
+if startup.MODE == "eager":
+    startup.warmup.run(load_models)
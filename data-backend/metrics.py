@@ -0,0 +1,187 @@
+# metrics.py
+#
+# Small in-process Prometheus registry for the prediction API.
+# Set METRICS_ENABLED=0 to turn everything off: stage() then hands back a shared
+# no-op context manager and main.py skips the middleware and /metrics route.
+
+import os
+import threading
+import time
+import resource
+from contextlib import nullcontext
+from contextvars import ContextVar
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, model_validator
+
+
+ENABLED = os.getenv("METRICS_ENABLED", "1") != "0"
+
+# Latency buckets in seconds (hot path is in the low milliseconds)
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Model label of the request being served, set by the middleware in main.py
+current_model = ContextVar("current_model", default="none")
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+_gauges = {}
+_caches = {}
+_NOOP = nullcontext()
+
+
+def _key(name, labels):
+    return (name, tuple(sorted(labels.items())))
+
+
+def inc(name, **labels):
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + 1
+
+
+def observe(name, value, **labels):
+    key = _key(name, labels)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = [[0] * len(BUCKETS), 0.0, 0]
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                hist[0][i] += 1
+                break
+        hist[1] += value
+        hist[2] += 1
+
+
+def set_gauge(name, value, **labels):
+    with _lock:
+        _gauges[_key(name, labels)] = value
+
+
+# Cache hit rates are pulled at scrape time, so caches pay nothing per lookup.
+# info_fn must return (hits, misses), e.g. lambda: fn.cache_info()[:2]
+def register_cache(name, info_fn):
+    _caches[name] = info_fn
+
+
+class _Stage:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe("prediction_stage_duration_seconds", time.perf_counter() - self.start,
+                model=current_model.get(), stage=self.stage)
+        return False
+
+
+# Time one stage of the hot path: parse, dataframe, clean_categories, predict_proba, serialize
+def stage(name):
+    if not ENABLED:
+        return _NOOP
+    return _Stage(name)
+
+
+# Load a model (joblib.load unless another loader is given) and record the load time
+def load_model(name, path, loader=None):
+    if loader is None:
+        import joblib
+        loader = joblib.load
+    start = time.perf_counter()
+    model = loader(path)
+    set_gauge("model_load_seconds", time.perf_counter() - start, model=name)
+    return model
+
+
+# Request schemas subclass this so Pydantic validation shows up as the "parse" stage
+if ENABLED:
+    class TimedModel(BaseModel):
+        @model_validator(mode="wrap")
+        @classmethod
+        def _time_parse(cls, data, handler):
+            with stage("parse"):
+                return handler(data)
+else:
+    TimedModel = BaseModel
+
+
+# Default response class for the app so JSON rendering shows up as the "serialize" stage
+if ENABLED:
+    class TimedJSONResponse(JSONResponse):
+        def render(self, content):
+            with stage("serialize"):
+                return super().render(content)
+else:
+    TimedJSONResponse = JSONResponse
+
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def _fmt_labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+
+
+def _collect_process():
+    rss = _rss_bytes()
+    if rss is not None:
+        set_gauge("process_resident_memory_bytes", rss)
+    # ru_maxrss is reported in kilobytes on Linux
+    set_gauge("process_peak_resident_memory_bytes", resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024)
+    for name, info_fn in _caches.items():
+        hits, misses = info_fn()
+        set_gauge("cache_hits", hits, cache=name)
+        set_gauge("cache_misses", misses, cache=name)
+        set_gauge("cache_hit_ratio", hits / (hits + misses) if hits + misses else 0.0, cache=name)
+
+
+# Prometheus text exposition format (version 0.0.4)
+def render():
+    _collect_process()
+    lines = []
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = sorted((k, (list(v[0]), v[1], v[2])) for k, v in _histograms.items())
+        gauges = sorted(_gauges.items())
+
+    seen = set()
+    for (name, labels), value in counters:
+        if name not in seen:
+            lines.append(f"# TYPE {name} counter")
+            seen.add(name)
+        lines.append(f"{name}{_fmt_labels(labels)} {value}")
+
+    for (name, labels), (buckets, total, count) in histograms:
+        if name not in seen:
+            lines.append(f"# TYPE {name} histogram")
+            seen.add(name)
+        cumulative = 0
+        for bound, n in zip(BUCKETS, buckets):
+            cumulative += n
+            lines.append(f"{name}_bucket{_fmt_labels(labels, [('le', bound)])} {cumulative}")
+        lines.append(f"{name}_bucket{_fmt_labels(labels, [('le', '+Inf')])} {count}")
+        lines.append(f"{name}_sum{_fmt_labels(labels)} {total}")
+        lines.append(f"{name}_count{_fmt_labels(labels)} {count}")
+
+    for (name, labels), value in gauges:
+        if name not in seen:
+            lines.append(f"# TYPE {name} gauge")
+            seen.add(name)
+        lines.append(f"{name}{_fmt_labels(labels)} {value}")
+
+    return "\n".join(lines) + "\n"
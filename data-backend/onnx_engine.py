@@ -0,0 +1,76 @@
+# onnx_engine.py
+#
+# onnxruntime inference backend for the exported pipelines (see export_onnx.py).
+# Selected with INFERENCE_ENGINE=onnx; OnnxModel has the same predict_proba(df)
+# interface as the sklearn pipeline, so the model wrappers in main.py do not change.
+#
+# The graph covers one-hot encoding and the forest. Numeric imputation and
+# scaling run here in float64 with the fitted values from the sidecar, then are
+# cast to float32 as sklearn's forest does, so split decisions match exactly;
+# clean_categories still runs in pandas before it, exactly as for sklearn.
+
+import json
+import os
+
+import numpy as np
+
+
+# Prediction requests are single rows on small instances, where extra threads only add
+# synchronisation cost; raise this for large batches on bigger machines.
+INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", "1"))
+
+_DTYPES = {"float": np.float32, "int64": np.int64, "string": object}
+
+
+def spec_path(onnx_path):
+    return onnx_path + ".json"
+
+
+class OnnxModel:
+    def __init__(self, path, intra_op_threads=INTRA_OP_THREADS):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = 1
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+
+        # [[column, dtype], ...] written by export_onnx.py, in graph input order
+        with open(spec_path(path)) as f:
+            spec = json.load(f)
+        self.inputs = spec["inputs"]
+        # {column: [fill, scale, offset]}; graphs exported before this scale internally
+        self.scaling = spec.get("scaling", {})
+        # Code no int64 category uses: non-integral and missing values are fed as
+        # this, so they one-hot to all zeros like any unknown value in sklearn
+        categories = spec.get("categories", {})
+        self.unknown_codes = {column: int(min(categories[column])) - 1 if categories.get(column) else np.iinfo(np.int64).min
+                              for column, dtype in self.inputs if dtype == "int64"}
+        # Fitted ranges and categories for the drift monitor (drift.fitted_domain)
+        self.domain_spec = spec.get("domain")
+        self.output = self.session.get_outputs()[1].name  # [label, probabilities]
+
+    def predict_proba(self, df):
+        feeds = {}
+        for column, dtype in self.inputs:
+            values = df[column].to_numpy()
+            if column in self.scaling:
+                fill, scale, offset = self.scaling[column]
+                values = values.astype(np.float64)
+                values = np.where(np.isnan(values), fill, values) * scale + offset
+            elif dtype == "int64":
+                # Truncating 5.5 to 5 would pick a category sklearn never matches
+                values = values.astype(np.float64)
+                integral = np.isfinite(values) & (values == np.floor(values))
+                values = np.where(integral, values, self.unknown_codes[column])
+            elif dtype == "string":
+                values = values.astype(str)
+            feeds[column] = values.astype(_DTYPES[dtype]).reshape(-1, 1)
+        # float64 like sklearn, so the route's return value stays JSON-serialisable
+        return self.session.run([self.output], feeds)[0].astype(np.float64)
+
+
+def load(path):
+    return OnnxModel(path)
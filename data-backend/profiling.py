@@ -0,0 +1,154 @@
+# profiling.py
+#
+# Opt-in sampling profiler for slow prediction requests. Off unless one of these is set:
+#   PROFILE_SLOW_MS      keep a profile for every request slower than this many milliseconds
+#   PROFILE_SAMPLE_RATE  keep a profile for this fraction of requests (0..1), whatever their latency
+#
+# Profiles are written to PROFILE_DIR in collapsed-stack ("folded") format, one
+# "frame;frame;frame count" line per stack, which flamegraph.pl, speedscope and
+# inferno read directly. Only the newest PROFILE_MAX_FILES are kept.
+
+import functools
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", "0"))
+SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+INTERVAL = float(os.getenv("PROFILE_INTERVAL_MS", "1")) / 1000
+MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "200"))
+
+ENABLED = SLOW_MS > 0 or SAMPLE_RATE > 0
+
+_ID_RE = re.compile(r"^(\d+)_(\w+)_(\d+)ms_(slow|sampled)$")
+
+
+# One background thread samples the stacks of every thread currently inside a
+# profiled handler, instead of starting a thread per request.
+class _Sampler:
+    def __init__(self, interval):
+        self.interval = interval
+        self.active = {}
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.thread = None
+
+    def add(self, thread_id):
+        counts = Counter()
+        with self.lock:
+            self.active[thread_id] = counts
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+                self.thread.start()
+        self.wake.set()
+        return counts
+
+    def remove(self, thread_id):
+        with self.lock:
+            self.active.pop(thread_id, None)
+
+    def _run(self):
+        while True:
+            with self.lock:
+                active = list(self.active.items())
+            if not active:
+                self.wake.clear()
+                self.wake.wait()
+                continue
+            frames = sys._current_frames()
+            for thread_id, counts in active:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    counts[_collapse(frame)] += 1
+            time.sleep(self.interval)
+
+
+def _collapse(frame):
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+_sampler = _Sampler(INTERVAL)
+
+
+def _save(name, elapsed_ms, reason, counts):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    profile_id = f"{time.time_ns() // 1_000_000}_{name}_{elapsed_ms:.0f}ms_{reason}"
+    with open(os.path.join(PROFILE_DIR, profile_id + ".folded"), "w") as f:
+        for stack, n in counts.most_common():
+            f.write(f"{stack} {n}\n")
+    # Keep only the newest MAX_FILES profiles
+    for old in list_profiles()[MAX_FILES:]:
+        try:
+            os.remove(os.path.join(PROFILE_DIR, old["id"] + ".folded"))
+        except OSError:
+            pass
+
+
+# Decorator for sync route handlers. FastAPI still sees the original signature
+# through functools.wraps, and the handler runs in the threadpool thread we sample.
+def profiled(fn):
+    if not ENABLED:
+        return fn
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        sampled = SAMPLE_RATE > 0 and random.random() < SAMPLE_RATE
+        if not sampled and SLOW_MS <= 0:
+            return fn(*args, **kwargs)
+        thread_id = threading.get_ident()
+        counts = _sampler.add(thread_id)
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            _sampler.remove(thread_id)
+            slow = SLOW_MS > 0 and elapsed_ms >= SLOW_MS
+            if (slow or sampled) and counts:
+                _save(fn.__name__, elapsed_ms, "slow" if slow else "sampled", counts)
+
+    return wrapper
+
+
+# Newest first
+def list_profiles():
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    profiles = []
+    for filename in os.listdir(PROFILE_DIR):
+        profile_id, ext = os.path.splitext(filename)
+        match = _ID_RE.match(profile_id)
+        if ext != ".folded" or match is None:
+            continue
+        created_ms, route, elapsed_ms, reason = match.groups()
+        profiles.append({
+            "id": profile_id,
+            "handler": route,
+            "elapsed_ms": int(elapsed_ms),
+            "reason": reason,
+            "created_ms": int(created_ms),
+            "bytes": os.path.getsize(os.path.join(PROFILE_DIR, filename)),
+        })
+    return sorted(profiles, key=lambda p: p["created_ms"], reverse=True)
+
+
+# Returns the folded stacks for a profile id, or None if there is no such profile
+def read_profile(profile_id):
+    if _ID_RE.match(profile_id) is None:
+        return None
+    path = os.path.join(PROFILE_DIR, profile_id + ".folded")
+    if not os.path.isfile(path):
+        return None
+    with open(path) as f:
+        return f.read()
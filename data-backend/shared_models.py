@@ -0,0 +1,149 @@
+# shared_models.py
+#
+# Node-wide model store for INFERENCE_ENGINE=shared. Every uvicorn worker
+# unpickling its own RandomForest costs the full forest in RAM per worker, and
+# sklearn's Tree copies its node arrays into private buffers on unpickle, so
+# joblib's mmap_mode cannot share them either.
+#
+# Instead, a loader step flattens every tree of a forest into a few contiguous
+# arrays and writes them as .npy files once:
+#
+#   python shared_models.py            # build model_store/ from every *_rf.pkl
+#
+# Workers np.load them with mmap_mode="r": the pages live once in the OS page
+# cache and every process gets a read-only view of the same memory, so extra
+# workers cost little more than the small preprocessing step. Worker start
+# also skips unpickling hundreds of Tree objects.
+#
+# SharedForestModel keeps the pipeline's fitted preprocessor and evaluates the
+# flattened forest with numpy, one vectorised step per tree level over all
+# trees and a chunk of CHUNK_ROWS rows at once. The build checks parity with
+# the pickled pipeline.
+
+import argparse
+import json
+import os
+import sys
+
+import joblib
+import numpy as np
+
+
+STORE_DIR = os.getenv("MODEL_STORE_DIR", "model_store")
+ARRAYS = ("feature", "threshold", "left", "right", "value", "roots")
+# Rows walked per step; bounds the (rows x trees) temporaries of large batches
+CHUNK_ROWS = 256
+
+
+def store_path(pkl_path):
+    return os.path.join(STORE_DIR, os.path.basename(pkl_path).replace(".pkl", ""))
+
+
+def flatten_forest(forest):
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    for estimator in forest.estimators_:
+        tree = estimator.tree_
+        n_nodes = tree.node_count
+        leaf = tree.children_left == -1
+        node_ids = np.arange(n_nodes)
+        # Leaves point at themselves, so walking max_depth steps is always safe
+        lefts.append(np.where(leaf, node_ids, tree.children_left) + offset)
+        rights.append(np.where(leaf, node_ids, tree.children_right) + offset)
+        features.append(np.where(leaf, 0, tree.feature))
+        thresholds.append(tree.threshold)
+        # Class fractions per node, as DecisionTreeClassifier.predict_proba normalises them
+        counts = tree.value[:, 0, :]
+        values.append(counts / counts.sum(axis=1, keepdims=True))
+        roots.append(offset)
+        offset += n_nodes
+
+    return {
+        "feature": np.concatenate(features).astype(np.int32),
+        "threshold": np.concatenate(thresholds).astype(np.float64),
+        "left": np.concatenate(lefts).astype(np.int32),
+        "right": np.concatenate(rights).astype(np.int32),
+        "value": np.concatenate(values).astype(np.float64),
+        "roots": np.asarray(roots, dtype=np.int32),
+    }
+
+
+def build(pkl_path):
+    model = joblib.load(pkl_path)
+    forest = model.named_steps['classifier']
+    out_dir = store_path(pkl_path)
+    os.makedirs(out_dir, exist_ok=True)
+
+    for name, array in flatten_forest(forest).items():
+        np.save(os.path.join(out_dir, name + ".npy"), array)
+    joblib.dump(model.named_steps['preprocessor'], os.path.join(out_dir, "preprocessor.pkl"))
+    with open(os.path.join(out_dir, "meta.json"), "w") as f:
+        json.dump({
+            "source": pkl_path,
+            "max_depth": int(max(e.tree_.max_depth for e in forest.estimators_)),
+            "n_features": int(forest.n_features_in_),
+            "classes": forest.classes_.tolist(),
+        }, f, indent=2)
+    return model, out_dir
+
+
+class SharedForestModel:
+    def __init__(self, path):
+        # Read-only views onto the page cache, shared by every process on the node
+        arrays = {name: np.load(os.path.join(path, name + ".npy"), mmap_mode="r") for name in ARRAYS}
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.value = arrays["value"]
+        self.roots = np.asarray(arrays["roots"])
+        self.preprocessor = joblib.load(os.path.join(path, "preprocessor.pkl"))
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        self.max_depth = meta["max_depth"]
+        self.n_features = meta["n_features"]
+        self.classes_ = np.asarray(meta["classes"])
+
+    def predict_proba(self, df):
+        X = self.preprocessor.transform(df)
+        if hasattr(X, "toarray"):
+            X = X.toarray()
+        # sklearn trees compare float32 features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        return np.concatenate([self._walk(X[start:start + CHUNK_ROWS])
+                               for start in range(0, max(len(X), 1), CHUNK_ROWS)])
+
+    def _walk(self, X):
+        rows = np.arange(X.shape[0])[:, None]
+        node = np.broadcast_to(self.roots, (X.shape[0], len(self.roots)))
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return self.value[node].mean(axis=1)
+
+
+def load(path):
+    return SharedForestModel(path)
+
+
+def main():
+    from benchmarks.inputs import MODELS, MODEL_FILES, sample_frame
+
+    parser = argparse.ArgumentParser(description="Build the memory-mapped model store")
+    parser.add_argument("--rows", type=int, default=2000, help="rows used for the parity check")
+    args = parser.parse_args()
+
+    ok = True
+    for wrapper_name, pkl_path in MODEL_FILES.items():
+        if not os.path.exists(pkl_path):
+            continue
+        model, out_dir = build(pkl_path)
+        df = sample_frame(model, MODELS[wrapper_name], args.rows, seed=1)
+        diff = np.abs(model.predict_proba(df) - load(out_dir).predict_proba(df)).max()
+        ok &= diff <= 1e-9
+        print(f"{wrapper_name}: {out_dir}, max |diff| {diff:.1e} {'OK' if diff <= 1e-9 else 'PARITY FAILED'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
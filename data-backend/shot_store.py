@@ -0,0 +1,248 @@
+# shot_store.py
+#
+# Historical StatsBomb shots behind the /shots routes, as a compact columnar
+# store. A build step turns the raw event exports from the statsbomb notebooks
+# into one directory of .npy columns per dataset:
+#
+#   python shot_store.py            # ../data/*_events.csv -> shot_store/<dataset>/
+#
+# Shots get the same cleaning as the notebooks (play patterns the models know,
+# EPL positions grouped into Defense/Midfield/Forward, minute_in_half and
+# match_period), and each one is scored with its goal model at build time, so
+# aggregates can put goals next to model xG (and StatsBomb's own xG when the
+# export has it) without any model work per query.
+#
+# Indexes, built on load:
+#   team, play_pattern, period   sorted row ids per value (posting lists)
+#   x/y                          uniform grid of SHOT_GRID_CELL metre cells; rows
+#                                are ordered by cell, so a cell is one slice
+# A query starts from its most selective index and checks the remaining
+# predicates column-wise on those candidates only.
+
+import argparse
+import ast
+import json
+import math
+import os
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from preprocessing_utils import clean_categories
+
+
+SHOT_DATA_DIR = os.getenv("SHOT_DATA_DIR", "../data")
+STORE_DIR = os.getenv("SHOT_STORE_DIR", "shot_store")
+GRID_CELL = float(os.getenv("SHOT_GRID_CELL", "5"))
+
+# StatsBomb pitch in metres-ish units
+PITCH_LENGTH = 120.0
+PITCH_WIDTH = 80.0
+
+# Dataset -> (events export, goal model, model input columns)
+DATASETS = {
+    "epl": ("epl2015_events.csv", "eplgoalsmodel_rf.pkl", ['match_period', 'minute_in_half', 'possession_team', 'play_pattern', 'position', 'x', 'y']),
+    "messi": ("messi_events.csv", "messigoalsmodel_rf.pkl", ['match_period', 'minute_in_half', 'play_pattern', 'under_pressure', 'x', 'y']),
+}
+
+PLAY_PATTERNS = ['Regular Play', 'From Free Kick', 'From Throw In', 'From Corner', 'From Counter', 'From Goal Kick']
+POSITION_GROUPS = [(r'.*Midfield.*', 'Midfield'), (r'.*(Forward|Wing).*', 'Forward'), (r'.*Back.*', 'Defense')]
+
+CATEGORICAL = ("team", "play_pattern", "position")
+NUMERIC = ("x", "y", "period", "minute", "under_pressure", "goal", "model_xg", "statsbomb_xg", "match_id")
+INDEXED = ("team", "play_pattern", "period")
+
+
+def _clean_value(value):
+    return str(value).lower().replace(" ", "_")
+
+
+# Notebook cleaning of the shot events, plus the goal model's xG for every shot
+def prepare(events, model, columns):
+    shots = events[events['type'] == 'Shot'].copy()
+    shots['under_pressure'] = shots['under_pressure'].fillna(False).astype(bool) if 'under_pressure' in shots else False
+    shots = shots[shots['play_pattern'].isin(PLAY_PATTERNS)]
+    if 'position' in columns:
+        for pattern, group in POSITION_GROUPS:
+            shots['position'] = shots['position'].replace(pattern, group, regex=True)
+        shots = shots[shots['position'].isin(['Defense', 'Midfield', 'Forward'])]
+    location = shots['location'].apply(ast.literal_eval)
+    shots['x'] = location.str[0].astype(float)
+    shots['y'] = location.str[1].astype(float)
+    shots['minute_in_half'] = np.where(shots['period'] == 1, shots['minute'], np.where(shots['period'] == 2, shots['minute'] - 45, np.nan))
+    shots['match_period'] = (shots['period'] == 2).astype(int)
+    shots['goal'] = shots['shot_outcome'] == 'Goal'
+    shots['statsbomb_xg'] = shots['shot_statsbomb_xg'].astype(float) if 'shot_statsbomb_xg' in shots else np.nan
+    shots['model_xg'] = model.predict_proba(clean_categories(shots[columns].copy()))[:, 1] if len(shots) else []
+    if 'position' not in shots:
+        shots['position'] = ''
+    return shots.reset_index(drop=True)
+
+
+def build(dataset, data_dir=SHOT_DATA_DIR):
+    filename, model_path, columns = DATASETS[dataset]
+    events = pd.read_csv(os.path.join(data_dir, filename), low_memory=False)
+    shots = prepare(events, joblib.load(model_path), columns)
+
+    out_dir = os.path.join(STORE_DIR, dataset)
+    os.makedirs(out_dir, exist_ok=True)
+    dictionaries = {}
+    for column in CATEGORICAL:
+        codes, values = pd.factorize(shots[column].astype(str).map(_clean_value))
+        np.save(os.path.join(out_dir, column + ".npy"), codes.astype(np.int32))
+        dictionaries[column] = values.tolist()
+    for column in NUMERIC:
+        dtype = np.float64 if column in ("x", "y", "model_xg", "statsbomb_xg") else np.int64
+        values = shots[column].astype(float).fillna(-1).to_numpy() if dtype is np.int64 else shots[column].to_numpy(dtype=float)
+        np.save(os.path.join(out_dir, column + ".npy"), values.astype(dtype))
+    with open(os.path.join(out_dir, "meta.json"), "w") as f:
+        json.dump({"source": filename, "model": model_path, "rows": len(shots), "dictionaries": dictionaries}, f, indent=2)
+    return len(shots), out_dir
+
+
+class ShotStore:
+    def __init__(self, path, cell=GRID_CELL):
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        self.dictionaries = meta["dictionaries"]
+        self.codes = {column: {value: code for code, value in enumerate(values)} for column, values in self.dictionaries.items()}
+        columns = {name: np.load(os.path.join(path, name + ".npy")) for name in CATEGORICAL + NUMERIC}
+        self.n_rows = meta["rows"]
+
+        # Rows ordered by grid cell, so each cell is a contiguous slice
+        self.cell = cell
+        self.nx = math.ceil(PITCH_LENGTH / cell)
+        self.ny = math.ceil(PITCH_WIDTH / cell)
+        cell_ids = self._cell_ids(columns["x"], columns["y"])
+        order = np.argsort(cell_ids, kind="stable")
+        self.columns = {name: values[order] for name, values in columns.items()}
+        self.cell_starts = np.searchsorted(cell_ids[order], np.arange(self.nx * self.ny + 1))
+
+        self.index = {}
+        for column in INDEXED:
+            values = self.columns[column]
+            order = np.argsort(values, kind="stable")
+            keys, starts = np.unique(values[order], return_index=True)
+            bounds = list(starts) + [len(order)]
+            self.index[column] = {int(key): order[bounds[i]:bounds[i + 1]] for i, key in enumerate(keys)}
+
+    def _cell_ids(self, x, y):
+        cx = np.clip((np.asarray(x) // self.cell).astype(np.int64), 0, self.nx - 1)
+        cy = np.clip((np.asarray(y) // self.cell).astype(np.int64), 0, self.ny - 1)
+        return cx * self.ny + cy
+
+    def _near(self, x, y, radius):
+        x0, x1 = (np.clip([(x - radius) // self.cell, (x + radius) // self.cell], 0, self.nx - 1)).astype(int)
+        y0, y1 = (np.clip([(y - radius) // self.cell, (y + radius) // self.cell], 0, self.ny - 1)).astype(int)
+        # Cells of one grid column are adjacent, so each column of the box is one slice
+        rows = [np.arange(self.cell_starts[cx * self.ny + y0], self.cell_starts[cx * self.ny + y1 + 1]) for cx in range(x0, x1 + 1)]
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        dx = self.columns["x"][rows] - x
+        dy = self.columns["y"][rows] - y
+        return rows[dx * dx + dy * dy <= radius * radius]
+
+    # Row ids matching every given filter; None means "any"
+    def query(self, team=None, play_pattern=None, period=None, under_pressure=None, near=None):
+        filters = {}
+        for column, value in (("team", team), ("play_pattern", play_pattern)):
+            if value is not None:
+                code = self.codes[column].get(_clean_value(value))
+                if code is None:
+                    return np.empty(0, dtype=np.int64)
+                filters[column] = code
+        if period is not None:
+            filters["period"] = period
+
+        candidates = [self.index[column].get(code, np.empty(0, dtype=np.int64)) for column, code in filters.items()]
+        if near is not None:
+            candidates.append(self._near(*near))
+        if not candidates:
+            rows = np.arange(self.n_rows)
+        else:
+            # Start from the most selective index, check the rest column-wise
+            rows = np.sort(min(candidates, key=len))
+            for column, code in filters.items():
+                rows = rows[self.columns[column][rows] == code]
+            if near is not None:
+                x, y, radius = near
+                rows = rows[(self.columns["x"][rows] - x) ** 2 + (self.columns["y"][rows] - y) ** 2 <= radius * radius]
+        if under_pressure is not None:
+            rows = rows[self.columns["under_pressure"][rows] == int(under_pressure)]
+        return rows
+
+    def summary(self, rows):
+        goals = int(self.columns["goal"][rows].sum())
+        model_xg = float(self.columns["model_xg"][rows].sum())
+        statsbomb = self.columns["statsbomb_xg"][rows]
+        return {
+            "shots": int(len(rows)),
+            "goals": goals,
+            "conversion_rate": goals / len(rows) if len(rows) else None,
+            "model_xg": model_xg,
+            "model_xg_per_shot": model_xg / len(rows) if len(rows) else None,
+            "goals_minus_model_xg": goals - model_xg,
+            "statsbomb_xg": float(np.nansum(statsbomb)) if len(rows) and not np.isnan(statsbomb).all() else None,
+        }
+
+    def shots(self, rows):
+        records = []
+        for row in rows:
+            record = {column: self.dictionaries[column][self.columns[column][row]] for column in CATEGORICAL}
+            for column in NUMERIC:
+                value = self.columns[column][row].item()
+                record[column] = None if value != value else value
+            record["goal"] = bool(record["goal"])
+            record["under_pressure"] = bool(record["under_pressure"])
+            records.append(record)
+        return records
+
+    # Shots, goals and model xG per bin_size x bin_size square of the pitch
+    def conversion_map(self, rows, bin_size):
+        nx, ny = math.ceil(PITCH_LENGTH / bin_size), math.ceil(PITCH_WIDTH / bin_size)
+        bx = np.clip((self.columns["x"][rows] // bin_size).astype(np.int64), 0, nx - 1)
+        by = np.clip((self.columns["y"][rows] // bin_size).astype(np.int64), 0, ny - 1)
+        bins = bx * ny + by
+        shots = np.bincount(bins, minlength=nx * ny).reshape(nx, ny)
+        goals = np.bincount(bins, weights=self.columns["goal"][rows], minlength=nx * ny).reshape(nx, ny)
+        model_xg = np.bincount(bins, weights=self.columns["model_xg"][rows], minlength=nx * ny).reshape(nx, ny)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rate = np.where(shots > 0, goals / shots, np.nan)
+        return {
+            "bin_size": bin_size,
+            "x_edges": (np.arange(nx + 1) * bin_size).clip(max=PITCH_LENGTH).tolist(),
+            "y_edges": (np.arange(ny + 1) * bin_size).clip(max=PITCH_WIDTH).tolist(),
+            "shots": shots.tolist(),
+            "goals": goals.astype(int).tolist(),
+            "conversion_rate": [[None if np.isnan(v) else float(v) for v in column] for column in rate],
+            "model_xg": model_xg.tolist(),
+        }
+
+
+# Stores that have been built, by dataset
+def load_all(store_dir=STORE_DIR):
+    stores = {}
+    for dataset in DATASETS:
+        path = os.path.join(store_dir, dataset)
+        if os.path.exists(os.path.join(path, "meta.json")):
+            stores[dataset] = ShotStore(path)
+    return stores
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the columnar shot store from StatsBomb event exports")
+    parser.add_argument("--data-dir", default=SHOT_DATA_DIR)
+    args = parser.parse_args()
+
+    for dataset, (filename, model_path, _) in DATASETS.items():
+        if not os.path.exists(os.path.join(args.data_dir, filename)):
+            print(f"{dataset}: {filename} not found in {args.data_dir}, skipped")
+            continue
+        rows, out_dir = build(dataset, args.data_dir)
+        print(f"{dataset}: {rows} shots -> {out_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+# snapshots.py
+#
+# Precomputed prediction snapshots, refreshed by an asyncio background task
+# instead of an external cron. Every SNAPSHOT_CHECK_SECONDS the scheduler asks
+# for a cheap version key (file versions of the models and context tables, the
+# set of upcoming rounds, ...); only when it differs from the last one is the
+# expensive build run, in a worker thread so the event loop keeps serving. The
+# version function only reads; reloading whatever changed is left to a watcher
+# (run_periodically), and the next version check sees the reloaded state.
+#
+# A build returns {key: content}. Each content is serialised to JSON once and
+# frozen into a Snapshot with its ETag, and the scheduler swaps the whole
+# snapshot in with a single assignment, so readers never see a half-built one
+# and the read path only hands out prebuilt bytes (or a 304).
+#
+# The ETag hashes the content alone, not snapshot_created_at, so a rebuild with
+# the same predictions keeps it and clients keep getting 304s; it is weak (W/)
+# because the body's timestamp still differs between such rebuilds.
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+
+from fastapi import HTTPException
+from fastapi.responses import Response
+
+import metrics
+
+
+CHECK_SECONDS = float(os.getenv("SNAPSHOT_CHECK_SECONDS", "60"))
+MAX_AGE = int(os.getenv("SNAPSHOT_MAX_AGE", "60"))
+
+logger = logging.getLogger(__name__)
+
+
+# (mtime, size) for each path, None for missing ones; directories use their newest file
+def file_versions(paths):
+    versions = []
+    for path in paths:
+        try:
+            if os.path.isdir(path):
+                stats = [os.stat(os.path.join(path, name)) for name in sorted(os.listdir(path))]
+            else:
+                stats = [os.stat(path)]
+            versions.append((path, max(s.st_mtime_ns for s in stats), sum(s.st_size for s in stats)))
+        except (OSError, ValueError):
+            versions.append((path, None))
+    return tuple(versions)
+
+
+class Snapshot:
+    def __init__(self, contents, version):
+        self.version = version
+        self.created_at = time.time()
+        self.bodies = {}
+        self.etags = {}
+        for key, content in contents.items():
+            payload = json.dumps(content, sort_keys=True).encode()
+            self.bodies[key] = json.dumps({**content, "snapshot_created_at": self.created_at}).encode()
+            self.etags[key] = 'W/"' + hashlib.sha256(payload).hexdigest()[:32] + '"'
+
+    def response(self, key, if_none_match=None):
+        if key not in self.bodies:
+            raise HTTPException(status_code=404, detail="Not in the current snapshot")
+        headers = {"ETag": self.etags[key], "Cache-Control": f"public, max-age={MAX_AGE}"}
+        if if_none_match is not None and self.etags[key] in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
+        return Response(self.bodies[key], media_type="application/json", headers=headers)
+
+
+# Runs fn in a worker thread every interval seconds, for watchers that keep the
+# state a snapshot is built from current; failures are logged and retried
+async def run_periodically(name, fn, interval=CHECK_SECONDS):
+    while True:
+        try:
+            await asyncio.to_thread(fn)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("%s failed", name)
+        await asyncio.sleep(interval)
+
+
+class SnapshotScheduler:
+    def __init__(self, name, version_fn, build_fn, interval=CHECK_SECONDS):
+        self.name = name
+        self.version_fn = version_fn
+        self.build_fn = build_fn
+        self.interval = interval
+        self.current = None
+
+    # One check; rebuilds and swaps in a new snapshot if the version changed
+    async def refresh(self):
+        version = await asyncio.to_thread(self.version_fn)
+        if self.current is not None and self.current.version == version:
+            return False
+        start = time.perf_counter()
+        snapshot = Snapshot(await asyncio.to_thread(self.build_fn), version)
+        self.current = snapshot
+        metrics.set_gauge("snapshot_build_seconds", time.perf_counter() - start, snapshot=self.name)
+        metrics.set_gauge("snapshot_created_timestamp_seconds", snapshot.created_at, snapshot=self.name)
+        return True
+
+    async def run(self):
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Keep serving the previous snapshot; the next check tries again
+                logger.exception("snapshot %s refresh failed", self.name)
+            await asyncio.sleep(self.interval)
+
+    def response(self, key, if_none_match=None):
+        if self.current is None:
+            raise HTTPException(status_code=503, detail="Snapshot not built yet", headers={"Retry-After": "5"})
+        return self.current.response(key, if_none_match)
@@ -0,0 +1,136 @@
+# startup.py
+#
+# Startup modes for the API, picked with STARTUP_MODE:
+#   eager       (default) import everything and load every model before uvicorn
+#               starts answering, as before
+#   background  import only what routing needs, answer /health with "warming"
+#               straight away and load the models in a background thread;
+#               other routes return 503 with Retry-After until they are loaded
+#
+# Heavy libraries (pandas, scikit-learn through the model modules) are imported
+# with lazy_import, so in background mode they load inside the warm-up thread
+# instead of before the port is open. importlib's LazyLoader is not thread-safe
+# before Python 3.12 (threads touching a module for the first time can find it
+# half-executed), so Warmup.run finishes every lazy import itself before the
+# models load and requests are let through; request threads never trigger one.
+
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+
+import metrics
+
+
+MODE = os.getenv("STARTUP_MODE", "eager")
+if MODE not in ("eager", "background"):
+    raise ValueError(f"STARTUP_MODE must be 'eager' or 'background', got {MODE!r}")
+
+# Paths that answer while the models are still loading
+WARMING_PATHS = ("/", "/health", "/metrics", "/docs", "/openapi.json")
+
+
+# Modules handed out by lazy_import, imported for real by finish_lazy_imports
+_lazy_modules = []
+
+
+# Module object whose import runs on first attribute access
+def lazy_import(name):
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    _lazy_modules.append(module)
+    return module
+
+
+# Any attribute access runs a lazy module's import; one thread, in order
+def finish_lazy_imports():
+    for module in _lazy_modules:
+        module.__name__
+
+
+# Wall-clock time the process was started, from /proc; import time of this module elsewhere
+def process_started_at():
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the parenthesised command name; starttime is field 22
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/stat") as f:
+            boot_time = next(int(line.split()[1]) for line in f if line.startswith("btime"))
+        return boot_time + start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, StopIteration):
+        return _imported_at
+
+
+_imported_at = time.time()
+
+
+class Warmup:
+    def __init__(self):
+        self.ready = False
+        self.error = None
+        self.started_at = process_started_at()
+        self.load_seconds = None
+        self.ready_after = None
+        self._lock = threading.Lock()
+
+    # Runs load_fn once; in eager mode a failure propagates and stops the import
+    def run(self, load_fn):
+        with self._lock:
+            if self.ready:
+                return
+            start = time.perf_counter()
+            try:
+                finish_lazy_imports()
+                load_fn()
+            except Exception as e:
+                self.error = f"{type(e).__name__}: {e}"
+                raise
+            self.load_seconds = time.perf_counter() - start
+            self.ready_after = time.time() - self.started_at
+            self.ready = True
+        metrics.set_gauge("startup_load_seconds", self.load_seconds)
+        metrics.set_gauge("startup_ready_seconds", self.ready_after)
+
+    def status(self):
+        if self.error is not None:
+            return "error"
+        return "ok" if self.ready else "warming"
+
+    def report(self):
+        return {
+            "mode": MODE,
+            "uptime_s": time.time() - self.started_at,
+            "load_s": self.load_seconds,
+            "ready_after_start_s": self.ready_after,
+            "error": self.error,
+        }
+
+
+warmup = Warmup()
+
+
+# Pure ASGI middleware (no per-request overhead once warm) that turns requests
+# away with 503 while the models load
+class WarmupGate:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if warmup.ready or scope["type"] != "http" or scope["path"] in WARMING_PATHS:
+            return await self.app(scope, receive, send)
+        status = warmup.status()
+        body = json.dumps({"detail": "Models are still loading" if status == "warming" else warmup.error, "status": status}).encode()
+        await send({"type": "http.response.start", "status": 503, "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", b"2"),
+        ]})
+        await send({"type": "http.response.body", "body": body})
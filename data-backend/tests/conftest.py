@@ -0,0 +1,14 @@
+# conftest.py
+#
+# The backend modules are flat files in data-backend/ and read leagues.json and
+# the model pickles relative to the working directory, as the service does, so
+# tests import and run from there.
+
+import os
+import sys
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
@@ -0,0 +1,60 @@
+# test_onnx_parity.py
+#
+# Exports every pipeline whose pickle is present and checks onnxruntime against
+# sklearn on export_onnx.parity_frame rows (uniform, integer, on-threshold and
+# off-category values), plus table positions sklearn's encoder treats as unknown,
+# and that the drift monitor sees the same fitted domain under both engines.
+
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("skl2onnx")
+
+import joblib
+
+import drift
+import export_onnx
+import onnx_engine
+from benchmarks.inputs import MODELS, MODEL_FILES, sample_frame
+from preprocessing_utils import clean_categories
+
+
+EXPORTABLE = [wrapper_name for wrapper_name, path in MODEL_FILES.items() if os.path.exists(path)]
+
+
+@pytest.fixture(scope="module", params=EXPORTABLE)
+def exported(request, tmp_path_factory):
+    wrapper_name = request.param
+    model = joblib.load(MODEL_FILES[wrapper_name])
+    onnx_path = str(tmp_path_factory.mktemp(wrapper_name) / "model.onnx")
+    export_onnx.write_onnx(model, MODELS[wrapper_name], onnx_path, MODEL_FILES[wrapper_name])
+    return wrapper_name, model, onnx_path
+
+
+def test_parity_frame(exported):
+    wrapper_name, model, onnx_path = exported
+    diff = export_onnx.parity_diff(model, MODELS[wrapper_name], onnx_path, rows=500)
+    assert diff.max() <= export_onnx.TOLERANCE
+
+
+@pytest.mark.parametrize("value", [5.5, np.nan, 0.0, 25.0])
+def test_off_category_positions(exported, value):
+    wrapper_name, model, onnx_path = exported
+    columns = MODELS[wrapper_name]
+    int_columns = [col for col, dtype in export_onnx.input_spec(model, columns) if dtype == "int64" and col.startswith("position")]
+    if not int_columns:
+        pytest.skip("no integer table-position inputs")
+    df = sample_frame(model, columns, 20, seed=2)
+    for col in int_columns:
+        df[col] = value
+    df = clean_categories(df)
+    converted = onnx_engine.OnnxModel(onnx_path).predict_proba(df)[:, 1]
+    assert np.abs(model.predict_proba(df)[:, 1] - converted).max() <= export_onnx.TOLERANCE
+
+
+def test_drift_domain(exported):
+    _, model, onnx_path = exported
+    assert drift.fitted_domain(onnx_engine.OnnxModel(onnx_path)) == drift.fitted_domain(model)
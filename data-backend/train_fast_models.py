@@ -0,0 +1,104 @@
+# train_fast_models.py
+#
+# Trains the "fast" tier for each prediction task: a logistic regression and a
+# shallow gradient-boosted model on the same preprocessing as the RandomForest
+# pipeline, each with sigmoid probability calibration. The candidate with the
+# lower held-out log-loss is saved next to the *_rf.pkl as *_fast.pkl.
+#
+# Input is the cleaned frame each notebook trains on, saved as CSV
+# (team_shortened for the match models, team_shots_df / messi_shots_df for goals):
+#
+#   python train_fast_models.py --data epl_outcomemodel=../data/eplmatches5y_clean.csv \
+#                               --data epl_goalsmodel=../data/epl2015_shots.csv
+#
+# A side-by-side report (latency, memory, Brier, log-loss) for both tiers is
+# written to fast_models_report.json. The notebooks split without a seed, so the
+# served forest's test rows cannot be recovered and any holdout here overlaps
+# its training data. The accurate tier is therefore scored as a clone of the
+# served pipeline (same hyperparameters) refitted on the fast tier's training
+# rows; latency and memory are those of that refit.
+
+import argparse
+import json
+import os
+import tempfile
+
+import joblib
+import pandas as pd
+from sklearn.base import clone
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import log_loss
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+
+from benchmarks.bench_tiers import compare_tiers
+from benchmarks.inputs import MODELS, MODEL_FILES, FAST_MODEL_FILES, TARGETS
+
+
+CANDIDATES = {
+    "logistic": lambda: LogisticRegression(max_iter=1000),
+    "shallow_gbm": lambda: HistGradientBoostingClassifier(max_depth=3, max_iter=100, learning_rate=0.1, random_state=42),
+}
+
+
+def build_pipeline(rf_model, candidate):
+    # Same imputer/scaler/cleaner/encoder configuration as the RF, refitted from scratch
+    preprocessor = clone(rf_model.named_steps['preprocessor'])
+    # HistGradientBoosting only accepts dense input
+    preprocessor.set_params(cat__encoder__sparse_output=False)
+    return Pipeline([
+        ("preprocessor", preprocessor),
+        ("classifier", CalibratedClassifierCV(CANDIDATES[candidate](), method="sigmoid", cv=5)),
+    ])
+
+
+def train_task(wrapper_name, csv_path, test_size=0.2, seed=42):
+    columns = MODELS[wrapper_name]
+    target = TARGETS[wrapper_name]
+    df = pd.read_csv(csv_path).dropna(subset=columns + [target])
+    X, y = df[columns], df[target].astype(int)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, stratify=y, random_state=seed)
+
+    rf_model = joblib.load(MODEL_FILES[wrapper_name])
+    scores, fitted = {}, {}
+    for candidate in CANDIDATES:
+        model = build_pipeline(rf_model, candidate).fit(X_train, y_train)
+        scores[candidate] = log_loss(y_test, model.predict_proba(X_test)[:, 1], labels=[0, 1])
+        fitted[candidate] = model
+
+    best = min(scores, key=scores.get)
+    joblib.dump(fitted[best], FAST_MODEL_FILES[wrapper_name])
+    print(f"{wrapper_name}: saved {best} to {FAST_MODEL_FILES[wrapper_name]} (log-loss {scores[best]:.4f})")
+
+    holdout = X_test.assign(**{target: y_test})
+    with tempfile.TemporaryDirectory(prefix="fast_tiers_") as tmp_dir:
+        reference_path = os.path.join(tmp_dir, os.path.basename(MODEL_FILES[wrapper_name]))
+        joblib.dump(clone(rf_model).fit(X_train, y_train), reference_path)
+        tiers = compare_tiers(wrapper_name, holdout, paths={"accurate": reference_path, "fast": FAST_MODEL_FILES[wrapper_name]})
+    tiers["accurate"]["file"] = f"{MODEL_FILES[wrapper_name]} refitted on the fast tier's training split"
+    return {"candidate": best, "candidate_log_loss": scores, "tiers": tiers}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train calibrated fast-tier models")
+    parser.add_argument("--data", action="append", required=True, metavar="TASK=CSV",
+                        help=f"cleaned training frame per task, TASK one of {', '.join(MODELS)}")
+    parser.add_argument("--report", default="fast_models_report.json")
+    args = parser.parse_args()
+
+    report = {}
+    for item in args.data:
+        wrapper_name, csv_path = item.split("=", 1)
+        if wrapper_name not in MODELS:
+            parser.error(f"unknown task {wrapper_name!r}")
+        report[wrapper_name] = train_task(wrapper_name, csv_path)
+
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.report}")
+
+
+if __name__ == "__main__":
+    main()
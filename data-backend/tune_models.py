@@ -0,0 +1,251 @@
+# tune_models.py
+#
+# Hyperparameter search for the accurate tier (the RandomForest pipelines),
+# with time-ordered cross-validation run on a process pool:
+#
+#   python tune_models.py --data epl_outcomemodel=../data/eplmatches5y_clean.csv \
+#                         --data messi_goalsmodel=../data/messi_shots.csv --workers 8
+#
+# Input is the same cleaned notebook frame as train_fast_models.py. Rows are
+# ordered by TIME_COLUMNS (or --time-column TASK=COL, file order otherwise) and
+# split with TimeSeriesSplit, so every validation fold comes after its training
+# data, as in serving.
+#
+# Each fold's preprocessor (cloned from the served pipeline) is fitted and the
+# encoded train/validation matrices are written once to a temporary directory;
+# workers load each fold once per process and only fit classifiers on them.
+#
+# Search is successive halving over a random sample of GRID: every candidate
+# is fitted on the most recent 1/ETA^k share of each training fold, and the
+# best 1/ETA by mean log-loss move on to the next, larger share, until the
+# survivors use the full folds. Every trial records log-loss, Brier score,
+# accuracy, fit time, node count and single-row / per-row batch latency of
+# the classifier (trees and depth are what predict_proba pays for in main.py).
+# Latencies are measured inside busy workers, so compare them with each other
+# rather than with benchmarks.run.
+#
+# The report (tuning_report.json) lists all trials, the final rung's
+# log-loss / latency Pareto front and the chosen config: the best log-loss
+# within --latency-budget-ms if given. Its pipeline is refitted on all rows and
+# saved as *_tuned.pkl; the served *_rf.pkl is never overwritten.
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score, brier_score_loss, log_loss
+from sklearn.model_selection import TimeSeriesSplit
+
+from benchmarks.inputs import MODELS, MODEL_FILES, TARGETS
+
+
+GRID = {
+    "n_estimators": [50, 100, 200, 300],
+    "max_depth": [6, 8, 10, 14, None],
+    "min_samples_leaf": [1, 2, 5],
+    "max_features": ["sqrt", 0.5],
+}
+# Settings of the served pipelines, always part of the sample
+BASELINE = {"n_estimators": 300, "max_depth": 10, "min_samples_leaf": 2, "max_features": "sqrt"}
+
+# Column that orders each task's rows in time
+TIME_COLUMNS = {
+    "epl_outcomemodel": "starting_at",
+    "laliga_outcomemodel": "starting_at",
+}
+
+ETA = 3
+RUNGS = 3
+LATENCY_REPEAT = 30
+BATCH_ROWS = 1000
+
+
+# Config dict as it appears in the report (None depth stays null)
+def _key(params):
+    return json.dumps(params, sort_keys=True)
+
+
+def encode_folds(rf_model, X, y, n_splits, cache_dir):
+    paths = []
+    for i, (train_idx, val_idx) in enumerate(TimeSeriesSplit(n_splits=n_splits).split(X)):
+        preprocessor = clone(rf_model.named_steps['preprocessor'])
+        X_train = preprocessor.fit_transform(X.iloc[train_idx])
+        X_val = preprocessor.transform(X.iloc[val_idx])
+        path = os.path.join(cache_dir, f"fold{i}.joblib")
+        joblib.dump((X_train, y[train_idx], X_val, y[val_idx]), path)
+        paths.append(path)
+    return paths
+
+
+# Encoded folds already loaded by this worker process
+_folds = {}
+
+
+def _load_fold(path):
+    if path not in _folds:
+        _folds[path] = joblib.load(path)
+    return _folds[path]
+
+
+def _median_seconds(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def evaluate(classifier, params, fold_path, share):
+    X_train, y_train, X_val, y_val = _load_fold(fold_path)
+    # Most recent share of the training fold
+    start_row = X_train.shape[0] - max(1, int(X_train.shape[0] * share))
+    X_train, y_train = X_train[start_row:], y_train[start_row:]
+
+    model = clone(classifier).set_params(**params, n_jobs=1)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_s = time.perf_counter() - start
+
+    # Single-class slices are possible on early, small folds
+    classes = list(model.classes_)
+    proba = model.predict_proba(X_val)[:, classes.index(1)] if 1 in classes else np.zeros(X_val.shape[0])
+    batch = X_val[np.arange(BATCH_ROWS) % X_val.shape[0]]
+    return {
+        "log_loss": log_loss(y_val, proba, labels=[0, 1]),
+        "brier": brier_score_loss(y_val, proba),
+        "accuracy": accuracy_score(y_val, proba >= 0.5),
+        "fit_s": fit_s,
+        "single_row_ms": _median_seconds(lambda: model.predict_proba(X_val[:1]), LATENCY_REPEAT) * 1000,
+        "batch_ms_per_row": _median_seconds(lambda: model.predict_proba(batch), 3) * 1000 / BATCH_ROWS,
+        "nodes": int(sum(tree.tree_.node_count for tree in model.estimators_)),
+        "depth": statistics.mean(tree.tree_.max_depth for tree in model.estimators_),
+    }
+
+
+def sample_configs(n_candidates, seed):
+    grid = [dict(zip(GRID, values)) for values in product(*GRID.values())]
+    rng = random.Random(seed)
+    configs = rng.sample(grid, min(n_candidates, len(grid)))
+    if BASELINE not in configs:
+        configs[0] = dict(BASELINE)
+    return configs
+
+
+def successive_halving(pool, classifier, configs, fold_paths):
+    trials = []
+    alive = configs
+    for rung in range(RUNGS):
+        share = ETA ** (rung - RUNGS + 1)
+        futures = {(_key(params), i): pool.submit(evaluate, classifier, params, path, share)
+                   for params in alive for i, path in enumerate(fold_paths)}
+        results = []
+        for params in alive:
+            folds = [futures[(_key(params), i)].result() for i in range(len(fold_paths))]
+            trial = {"rung": rung, "train_share": share, "params": params}
+            trial.update({metric: statistics.mean(fold[metric] for fold in folds) for metric in folds[0]})
+            trial["log_loss_std"] = statistics.pstdev(fold["log_loss"] for fold in folds)
+            results.append(trial)
+        results.sort(key=lambda trial: trial["log_loss"])
+        trials.extend(results)
+        print(f"  rung {rung}: {len(alive)} configs on {share:.0%} of each fold, best log-loss {results[0]['log_loss']:.4f}")
+        alive = [trial["params"] for trial in results[:max(1, len(results) // ETA)]]
+    return trials, results
+
+
+def pareto_front(trials):
+    front = []
+    for trial in sorted(trials, key=lambda t: (t["single_row_ms"], t["log_loss"])):
+        if not front or trial["log_loss"] < front[-1]["log_loss"]:
+            front.append(trial)
+    return front
+
+
+def tune_task(pool, wrapper_name, csv_path, time_column, n_splits, n_candidates, latency_budget_ms, seed):
+    columns = MODELS[wrapper_name]
+    target = TARGETS[wrapper_name]
+    df = pd.read_csv(csv_path)
+    if time_column is not None and time_column not in df:
+        print(f"{wrapper_name}: no {time_column!r} column, using file order")
+        time_column = None
+    if time_column is not None:
+        df = df.iloc[np.argsort(pd.to_datetime(df[time_column]).to_numpy(), kind="stable")]
+    df = df.dropna(subset=columns + [target]).reset_index(drop=True)
+    X, y = df[columns], df[target].astype(int).to_numpy()
+
+    rf_model = joblib.load(MODEL_FILES[wrapper_name])
+    # Unfitted copy, so submitting trials does not pickle the served forest
+    classifier = clone(rf_model.named_steps['classifier'])
+    configs = sample_configs(n_candidates, seed)
+    print(f"{wrapper_name}: {len(df)} rows ordered by {time_column or 'file order'}, {n_splits} folds, {len(configs)} configs")
+
+    with tempfile.TemporaryDirectory(prefix="tune_folds_") as cache_dir:
+        fold_paths = encode_folds(rf_model, X, y, n_splits, cache_dir)
+        trials, final = successive_halving(pool, classifier, configs, fold_paths)
+
+    within = [trial for trial in final if latency_budget_ms is None or trial["single_row_ms"] <= latency_budget_ms]
+    chosen = within[0] if within else min(final, key=lambda trial: trial["single_row_ms"])
+    baseline = next((trial for trial in reversed(trials) if trial["params"] == BASELINE), None)
+
+    tuned = clone(rf_model).set_params(**{f"classifier__{name}": value for name, value in chosen["params"].items()})
+    tuned.fit(X, y)
+    out_path = MODEL_FILES[wrapper_name].replace("_rf.pkl", "_tuned.pkl")
+    joblib.dump(tuned, out_path)
+    print(f"{wrapper_name}: saved {chosen['params']} to {out_path} (log-loss {chosen['log_loss']:.4f}, {chosen['single_row_ms']:.2f} ms/row)")
+
+    return {
+        "rows": len(df),
+        "time_column": time_column,
+        "folds": n_splits,
+        "chosen": chosen,
+        "baseline": baseline,
+        "pareto_front": pareto_front(final),
+        "trials": trials,
+        "saved_to": out_path,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Successive-halving hyperparameter search for the RandomForest pipelines")
+    parser.add_argument("--data", action="append", required=True, metavar="TASK=CSV",
+                        help=f"cleaned training frame per task, TASK one of {', '.join(MODELS)}")
+    parser.add_argument("--time-column", action="append", default=[], metavar="TASK=COLUMN",
+                        help="column ordering the task's rows in time (defaults: TIME_COLUMNS, else file order)")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--candidates", type=int, default=60, help="configs sampled from GRID")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--latency-budget-ms", type=float, default=None,
+                        help="pick the best log-loss whose single-row classifier latency fits")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--report", default="tuning_report.json")
+    args = parser.parse_args()
+
+    time_columns = dict(TIME_COLUMNS)
+    time_columns.update(item.split("=", 1) for item in args.time_column)
+
+    report = {}
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for item in args.data:
+            wrapper_name, csv_path = item.split("=", 1)
+            if wrapper_name not in MODELS:
+                parser.error(f"unknown task {wrapper_name!r}")
+            report[wrapper_name] = tune_task(pool, wrapper_name, csv_path, time_columns.get(wrapper_name),
+                                             args.folds, args.candidates, args.latency_budget_ms, args.seed)
+
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,21 +2,155 @@ import streamlit as st
 import pandas as pd
 import joblib
 import plotly.express as px
-import plotly.graph_objects as go
 import matplotlib.pyplot as plt
 import io
+import os
 import base64
-from PIL import Image, ImageOps
 import numpy as np
 import requests
 from streamlit_option_menu import option_menu
 
+import leagues
+from assets import show_image
+from pitch import pitch_figure
+
 
 def clean_categories(X):
     for col in X.select_dtypes(include='object').columns:
         X[col] = X[col].str.lower().str.replace(" ", "_")
     return X
 
+# Match outcome tool for one league of the registry (leagues.py)
+def match_outcome(key, league):
+    # Sticky container style and empty slot for the league
+    st.markdown("""
+    <style>
+        .sticky-prob {
+            position: fixed;
+            top: 80px;
+            right: 30px;
+            width: 280px;
+            background-color: #063672; /* Updated background */
+            color: white; /* Text color */
+            padding: 15px;
+            border-radius: 12px;
+            box-shadow: 0 4px 12px rgba(0, 0, 0, 0.4);
+            z-index: 9999;
+            text-align: center;
+            font-family: 'Segoe UI', sans-serif;
+        }
+    </style>
+""", unsafe_allow_html=True)
+
+    league_match_prob_container = st.empty()
+    if league.get("banner"):
+        show_image(league["banner"])
+
+    st.markdown("###### Adjust the parameters below to see how the features affect the probability of the home team winning.")
+
+    # Feature importances need the trained pipeline next to app.py
+    if os.path.exists(league["model"]):
+        important_features = st.checkbox("_Check this box to see the amout of influence the features have on the model "
+        "(it will not affect the model's prediction if you click here):_", value=False, key=f"{key}_win_prob_feature_importance")
+
+        if important_features == True:
+            # Load trained model pipeline
+            model = joblib.load(league["model"])
+
+            ## Feature Importances
+            numeric_features = ['match_temperature', 'wind_speed',	'humidity',	'pressure',	'clouds']
+            categorical_features = ['team_name_home', 'team_name_away', 'position_away', 'position_home', 'time_of_day']
+
+            importances = model.named_steps['classifier'].feature_importances_
+            feature_names = numeric_features + (model.named_steps['preprocessor'].transformers_[1][1].named_steps['encoder'].get_feature_names_out(categorical_features).tolist())
+
+            # Clean feature names
+            def clean_name(name):
+                name = name.lower()
+                if 'name_' in name:
+                    name = name.replace('name_', '')
+                return name.replace('_', ' ')
+
+
+            # Sort by importance
+            sorted_idx = np.argsort(importances)
+            sorted_importances = importances[sorted_idx]
+            sorted_features = [clean_name(feature_names[i]) for i in sorted_idx]
+
+            # Dark mode styling
+            plt.style.use('dark_background')
+            fig, ax = plt.subplots(figsize=(10, len(sorted_features) * 0.3))
+            ax.set_facecolor('#063672')  
+            fig.patch.set_facecolor('#063672')
+
+            # Draw lollipop chart
+            ax.hlines(y=sorted_features, xmin=0, xmax=sorted_importances, color='#444', linewidth=1)
+            ax.plot(sorted_importances, sorted_features, "o", markersize=10, color='#EF0107') 
+
+            # Axes and labels
+            ax.set_xlabel("Feature Importance", fontsize=12, color='white')
+            ax.set_title("Feature Importances", fontsize=14, color='white', weight='bold')
+            ax.tick_params(colors='white', labelsize=10)
+            ax.grid(axis='x', linestyle='--', alpha=0.3, color='white')
+            fig.tight_layout()
+
+            # Streamlit:
+            st.pyplot(fig)
+
+    # Options for widgets
+    home_team = league["teams"]
+    time_in_day = ['earlier', 'later']
+    table_size = league.get("table_size", 20)
+    sliders = league["sliders"]
+
+    # Streamlit widgets
+    team_home = st.selectbox("⬜ _**Choose a home_team**_", home_team, key=f"{key}_home_team")
+    crest = leagues.crest_path(league, team_home)
+    if crest:
+        show_image(crest)
+
+    team_away_list = [team for team in home_team if team != team_home]
+    team_away = st.selectbox("🟥 _**Choose an away team**_", team_away_list, key=f"{key}_away_team")
+    crest = leagues.crest_path(league, team_away)
+    if crest:
+        show_image(crest)
+
+    home_position = st.selectbox("⬜ _**Choose the home team's current standing on the table:**_", np.arange(1,table_size+1,1).astype(float), key=f"{key}_home_position")
+    away_position_list = [float(i) for i in range(1,table_size+1) if i != home_position] 
+    away_position = st.selectbox("🟥 _**Choose the away team's current standing on the table:**_", away_position_list, key=f"{key}_away_position")
+
+    match_temp = st.slider("🌡️ _**Choose temperature at the start of the match (Celsius):**_", *sliders["match_temperature"], key=f"{key}_match_temp")
+    wind_speeds = st.slider("🌀 _**Choose the wind speed at the start of the match (meters/second):**_", *sliders["wind_speed"], key=f"{key}_wind_speeds")
+    humidity_level = st.slider("🌫️ _**Choose the humidity percentage at the start of the match:**_", *sliders["humidity"], key=f"{key}_humidity")
+    pressure_amount = st.slider("🥵 _**Choose the atmospheric pressure at the start of the match (millibars):**_", *sliders["pressure"], key=f"{key}_pressure")
+    cloudiness = st.slider("☁️ _**Choose the percentage of cloud coverage at the start of the match:**_", *sliders["clouds"], key=f"{key}_cloudiness")
+
+    cutoff = leagues.cutoff_label(league)
+    time = st.selectbox(f"⌛ _**Choose if the match was played earlier in the day (before or at {cutoff}) or later in day (after {cutoff}):**_", time_in_day, key=f"{key}_match_time")
+
+    input_data = {'position_away':away_position, 'position_home':home_position, 'match_temperature':match_temp, 'wind_speed':wind_speeds, 
+                'humidity':humidity_level, 'pressure':pressure_amount, 'clouds':cloudiness, 'team_name_home':team_home, 'team_name_away':team_away, 'time_of_day':time}
+
+    # Send request to FastAPI
+    # response = requests.post(f"http://127.0.0.1:8000/predict/matchoutcome/{key}", json=input_data)
+    # response = requests.post(f"http://backend:8000/predict/matchoutcome/{key}", json=input_data)
+    # NEW (Render-friendly)
+    response = requests.post(f"https://backend-qhog.onrender.com/predict/matchoutcome/{key}", json=input_data)
+
+    if response.status_code == 200:
+        result = response.json()
+        probability = result['prediction']
+
+        league_match_prob_container.markdown(
+        f"<div class='sticky-prob'>⚽ <strong>{league.get('short_name', league['name'])} - Winning Prob for {team_home}:</strong> "
+        f"<span style='color:#EF0107; font-size: 1.5em'>{probability:.2%}</span></div>",
+        unsafe_allow_html=True
+    )
+    else:
+        st.error("Something went wrong")
+        st.write(response.status_code)
+
+
 # Set up UI
 st.set_page_config(layout="centered", initial_sidebar_state='expanded')
 
@@ -45,26 +179,21 @@ if page == "Home":
     
     col1, col2, col3 = st.columns(3)
     with col1: 
-        image_newcast_crys = Image.open('img/epl_match_table_top.png')
-        st.image(image_newcast_crys)
+        show_image('img/epl_match_table_top.png')
 
         st.write("_**The image below was captured at 1:30pm (EST) on April 16th, 1 hour before the start of the match. Google's probability outcome was " \
         "in favor of Newcastle winning at 58%**_") 
         
     with col2:
-        image_weather = Image.open('img/epl_match_hum_press.png')
-        st.image(image_weather)
-        image_table = Image.open('img/epl_match_table_bottom.png')
-        st.image(image_table)
+        show_image('img/epl_match_hum_press.png')
+        show_image('img/epl_match_table_bottom.png')
 
         st.write("_**The match was played at St. James' Park in London. Newcastle United is ranked 4th in the table, " \
         "while Crystal Palace is ranked 12th. Live weather data adds real features to our model**_")
     
     with col3:
-        image_match_tool = Image.open('img/epl_match_app_top.png')
-        st.image(image_match_tool)
-        image_table = Image.open('img/epl_match_app_bottom.png')
-        st.image(image_table)
+        show_image('img/epl_match_app_top.png')
+        show_image('img/epl_match_app_bottom.png')
 
         st.write("_**Inputting all the features from the match, our application favored Newcastle winning at 55.72%**_")
 
@@ -75,17 +204,14 @@ if page == "Home":
     col1, col2 = st.columns([0.75,0.3])
 
     with col1:
-        image_rice_goal = Image.open('img/epl_match_ars_goal.png')
-        st.image(image_rice_goal)
+        show_image('img/epl_match_ars_goal.png')
         st.write("_**Arsenal's Declan Rice, scored this goal on March 9th against Manchester United " \
         "during a regular season match. The goal was scored on the 73rd minute during a regular play. " \
         "Adjusting the features on our application, we found the probability of scoring at 53.67%.**_")
 
     with col2:
-        image_app_top = Image.open('img/epl_match_ars_goal_app_top.png')
-        image_app_bottom = Image.open('img/epl_match_ars_goal_app_bottom.png')
-        st.image(image_app_top)
-        st.image(image_app_bottom)
+        show_image('img/epl_match_ars_goal_app_top.png')
+        show_image('img/epl_match_ars_goal_app_bottom.png')
     
 if page == 'Prediction Tools':
 
@@ -127,9 +253,7 @@ if page == 'Prediction Tools':
 
             epl_prob_container = st.empty()
 
-            image_epl = Image.open('img/epl.jpg')
-            # image_display.image(image_epl)
-            st.image(image_epl)
+            show_image('img/epl.jpg')
 
             # Load trained model pipeline
             model = joblib.load("eplgoalsmodel_rf.pkl")
@@ -204,10 +328,7 @@ if page == 'Prediction Tools':
             # Streamlit widgets
             
             team = st.selectbox("🤩 _**Choose which team will be used for the model:**_", possession_team, key="epl_goal_team")
-            for team_name in possession_team:
-                if team == team_name:
-                    image_epl_team = Image.open(f'img_epl/{team}.jpg')
-                    st.image(image_epl_team)
+            show_image(f'img_epl/{team}.jpg')
             position = st.selectbox("_**⚽ Choose the player role of the goal scorer:**_", positions, key="epl_player_position")
             play_pattern = st.selectbox("_**↗️ Choose in what way the goal is being scored:**_", play_patterns, key="epl_player_pattern")
             # Select period
@@ -222,70 +343,8 @@ if page == 'Prediction Tools':
             x = st.slider("_**📍 Choose the player's horizontal position on the field:**_", 60.0, 120.0, 100.0, key='x_position')
             y = st.slider("_**📍 Choose the player's vertical position on the field:**_", 0.0, 80.0, 40.0, key='y_position')
             st.markdown("###### Look at how the player's position moves as you move the sliders above")
-            # Create Plotly figure
-            epl_fig = go.Figure()
-
-            # Add player position
-            epl_fig.add_trace(go.Scatter(
-                x=[x],
-                y=[y],
-                mode='markers',
-                marker=dict(size=14, color='red'),
-                name='Player Position',
-                showlegend=False
-            ))
-
-            # Draw pitch lines manually
-            pitch_shapes = []
-
-            # Outer boundaries
-            pitch_shapes.append(dict(type="rect", x0=0, y0=0, x1=120, y1=80, line=dict(color="white", width=3)))
-
-            # Center line
-            pitch_shapes.append(dict(type="line", x0=60, y0=0, x1=60, y1=80, line=dict(color="white", width=3)))
-
-            # Penalty areas
-            pitch_shapes += [
-                dict(type="rect", x0=0, y0=18, x1=18, y1=62, line=dict(color="white")),
-                dict(type="rect", x0=102, y0=18, x1=120, y1=62, line=dict(color="white")),
-            ]
-
-            # 6-yard boxes
-            pitch_shapes += [
-                dict(type="rect", x0=0, y0=30, x1=6, y1=50, line=dict(color="white")),
-                dict(type="rect", x0=114, y0=30, x1=120, y1=50, line=dict(color="white")),
-            ]
-
-            # Center circle (approximate)
-            circle_points = 100
-            circle_x = [60 + 10 * np.cos(2 * np.pi * i / circle_points) for i in range(circle_points)]
-            circle_y = [40 + 10 * np.sin(2 * np.pi * i / circle_points) for i in range(circle_points)]
-            epl_fig.add_trace(go.Scatter(x=circle_x, y=circle_y, mode='lines', line=dict(color='white'), showlegend=False))
-
-            # Update layout
-            epl_fig.update_layout(
-            title="🔴 Player Position",
-            shapes=pitch_shapes,
-            xaxis=dict(
-                range=[0, 120],
-                showgrid=False,
-                zeroline=False,
-                constrain='domain'  # ✨ Prevents excess padding on the x-axis
-            ),
-            yaxis=dict(
-                range=[0, 80],
-                showgrid=False,
-                zeroline=False,
-                scaleanchor="x",
-                scaleratio=1
-            ),
-            height=430,
-            margin=dict(l=0, r=0, t=40, b=0),  # ✨ Tighter margins
-            plot_bgcolor='#1f4722'
-        )
-            
-            # Show in Streamlit
-            st.plotly_chart(epl_fig, key="epl_fig_chart")
+            # Pitch figure: one per session, only the player marker moves per rerun
+            st.plotly_chart(pitch_figure(x, y, "epl_pitch"), key="epl_fig_chart")
 
             ## Request to API
             minute_in_half = int(minute) if period == 1 else int(minute - 45)
@@ -343,9 +402,7 @@ if page == 'Prediction Tools':
         """, unsafe_allow_html=True)
             messi_prob_container = st.empty()
 
-            image_campnou = Image.open('img/campnou.webp')
-            # image_display.image(image_campnou)
-            st.image(image_campnou)
+            show_image('img/campnou.webp')
             # Load trained model pipeline        
             model = joblib.load("messigoalsmodel_rf.pkl")
 
@@ -395,8 +452,7 @@ if page == 'Prediction Tools':
                 # Streamlit:
                 st.pyplot(fig)
 
-            image_messi = Image.open('img/messi.jpg')
-            st.image(image_messi)
+            show_image('img/messi.jpg')
             # Define valid options (replace these with your actual values from your dataset if needed)
 
             play_patterns = ['From Corner',
@@ -436,70 +492,8 @@ if page == 'Prediction Tools':
             y = st.slider("_**📍 Choose the player's vertical position on the field:**_", 0.0, 80.0, 40.0, key="messi_y_position")
             st.markdown("###### Look at how the player's position moves as you move the sliders above")
 
-            # Create Plotly figure
-            messi_fig = go.Figure()
-
-            # Add player position
-            messi_fig.add_trace(go.Scatter(
-                x=[x],
-                y=[y],
-                mode='markers',
-                marker=dict(size=14, color='red'),
-                name='Player Position',
-                showlegend=False
-            ))
-
-            # Draw pitch lines manually
-            pitch_shapes = []
-
-            # Outer boundaries
-            pitch_shapes.append(dict(type="rect", x0=0, y0=0, x1=120, y1=80, line=dict(color="white", width=3)))
-
-            # Center line
-            pitch_shapes.append(dict(type="line", x0=60, y0=0, x1=60, y1=80, line=dict(color="white", width=3)))
-
-            # Penalty areas
-            pitch_shapes += [
-                dict(type="rect", x0=0, y0=18, x1=18, y1=62, line=dict(color="white")),
-                dict(type="rect", x0=102, y0=18, x1=120, y1=62, line=dict(color="white")),
-            ]
-
-            # 6-yard boxes
-            pitch_shapes += [
-                dict(type="rect", x0=0, y0=30, x1=6, y1=50, line=dict(color="white")),
-                dict(type="rect", x0=114, y0=30, x1=120, y1=50, line=dict(color="white")),
-            ]
-
-            # Center circle (approximate)
-            circle_points = 100
-            circle_x = [60 + 10 * np.cos(2 * np.pi * i / circle_points) for i in range(circle_points)]
-            circle_y = [40 + 10 * np.sin(2 * np.pi * i / circle_points) for i in range(circle_points)]
-            messi_fig.add_trace(go.Scatter(x=circle_x, y=circle_y, mode='lines', line=dict(color='white'), showlegend=False))
-
-            # Update layout
-            messi_fig.update_layout(
-            title="🔴 Player Position",
-            shapes=pitch_shapes,
-            xaxis=dict(
-                range=[0, 120],
-                showgrid=False,
-                zeroline=False,
-                constrain='domain'  # ✨ Prevents excess padding on the x-axis
-            ),
-            yaxis=dict(
-                range=[0, 80],
-                showgrid=False,
-                zeroline=False,
-                scaleanchor="x",
-                scaleratio=1
-            ),
-            height=430,
-            margin=dict(l=0, r=0, t=40, b=0),  # ✨ Tighter margins
-            plot_bgcolor='#1f4722'
-        )
-            
-            # Show in Streamlit
-            st.plotly_chart(messi_fig, key="messi_fig_chart")
+            # Pitch figure: one per session, only the player marker moves per rerun
+            st.plotly_chart(pitch_figure(x, y, "messi_pitch"), key="messi_fig_chart")
 
             ## Request to API
             minute_in_half = int(minute) if period == 1 else int(minute - 45)
@@ -526,286 +520,14 @@ if page == 'Prediction Tools':
                 st.write(response.status_code)
 
     if option == 'Match Outcome':
-        if option == 'Match Outcome':   
-            selection = st.selectbox(
-                "Choose your favorite league",
-                ("English Premier League", "La Liga")
+        registry = leagues.registry()
+        selection = st.selectbox(
+            "Choose your favorite league",
+            list(registry),
+            format_func=lambda key: registry[key]["name"]
         )
 
-        match_prob_container = st.empty()
-
-        if selection == "English Premier League":
-
-            # Sticky container style and empty slot for EPL
-            st.markdown("""
-            <style>
-                .sticky-prob {
-                    position: fixed;
-                    top: 80px;
-                    right: 30px;
-                    width: 280px;
-                    background-color: #063672; /* Updated background */
-                    color: white; /* Text color */
-                    padding: 15px;
-                    border-radius: 12px;
-                    box-shadow: 0 4px 12px rgba(0, 0, 0, 0.4);
-                    z-index: 9999;
-                    text-align: center;
-                    font-family: 'Segoe UI', sans-serif;
-                }
-            </style>
-        """, unsafe_allow_html=True)
-            
-            epl_match_prob_container = st.empty()
-            image = Image.open('img/epl.jpg')
-            st.image(image)
-
-            # Load trained model pipeline
-            model = joblib.load("eplmatches5ymodel_rf.pkl")
-
-            st.markdown("###### Adjust the parameters below to see how the features affect the probability of the home team winning.")
-
-            important_features = st.checkbox("_Check this box to see the amout of influence the features have on the model "
-            "(it will not affect the model's prediction if you click here):_", value=False, key="epl_win_prob_feature_importance")
-
-            if important_features == True:
-                ## Feature Importances
-                numeric_features = ['match_temperature', 'wind_speed',	'humidity',	'pressure',	'clouds']
-                categorical_features = ['team_name_home', 'team_name_away', 'position_away', 'position_home', 'time_of_day']
-
-                importances = model.named_steps['classifier'].feature_importances_
-                feature_names = numeric_features + (model.named_steps['preprocessor'].transformers_[1][1].named_steps['encoder'].get_feature_names_out(categorical_features).tolist())
-                
-                # Clean feature names
-                def clean_name(name):
-                    name = name.lower()
-                    if 'name_' in name:
-                        name = name.replace('name_', '')
-                    return name.replace('_', ' ')
-
-            
-                # Sort by importance
-                sorted_idx = np.argsort(importances)
-                sorted_importances = importances[sorted_idx]
-                sorted_features = [clean_name(feature_names[i]) for i in sorted_idx]
-
-                # Dark mode styling
-                plt.style.use('dark_background')
-                fig, ax = plt.subplots(figsize=(10, len(sorted_features) * 0.3))
-                ax.set_facecolor('#063672')  
-                fig.patch.set_facecolor('#063672')
-
-                # Draw lollipop chart
-                ax.hlines(y=sorted_features, xmin=0, xmax=sorted_importances, color='#444', linewidth=1)
-                ax.plot(sorted_importances, sorted_features, "o", markersize=10, color='#EF0107') 
-
-                # Axes and labels
-                ax.set_xlabel("Feature Importance", fontsize=12, color='white')
-                ax.set_title("Feature Importances", fontsize=14, color='white', weight='bold')
-                ax.tick_params(colors='white', labelsize=10)
-                ax.grid(axis='x', linestyle='--', alpha=0.3, color='white')
-                fig.tight_layout()
-
-                # Streamlit:
-                st.pyplot(fig)
-
-            # Options for widgets
-            home_team = ['Arsenal', 'AFC Bournemouth', 'Aston Villa', 'Brentford',
-             'Brighton & Hove Albion', 'Burnley', 'Chelsea', 'Crystal Palace',
-             'Everton', 'Fulham', 'Ipswich Town', 'Leeds United', 'Leicester City',
-             'Liverpool', 'Luton Town', 'Manchester City', 'Manchester United',
-             'Newcastle United', 'Norwich City', 'Nottingham Forest', 'Sheffield United',
-             'Southampton', 'Tottenham Hotspur', 'Watford', 'West Ham United',
-             'Wolverhampton Wanderers']
-
-            time_in_day = ['earlier', 'later']
-            
-            # Streamlit widgets
-            
-            # Streamlit widgets
-            team_home = st.selectbox("⬜ _**Choose a home_team**_", home_team, key= "epl_home_team")
-
-            for team_name in home_team:
-                if team_home == team_name:
-                    image_epl_team = Image.open(f'img_epl/{team_name}.jpg')
-                    st.image(image_epl_team)
-
-            team_away_list = [team for team in home_team if team != team_home]
-            team_away = st.selectbox("🟥 _**Choose an away team**_", team_away_list, key= "epl_away_team")
-
-            for team_name in team_away_list:
-                if team_name == team_away:
-                    image_epl_team = Image.open(f'img_epl/{team_name}.jpg')
-                    st.image(image_epl_team)
-
-            home_position = st.selectbox("⬜ _**Choose the home team's current standing on the table:**_", np.arange(1,21,1).astype(float), key= "epl_home_position")
-            away_position_list = [float(i) for i in range(1,21) if i != home_position] 
-            away_position = st.selectbox("🟥 _**Choose the away team's current standing on the table:**_", away_position_list, key= "epl_away_position")
-
-            match_temp = st.slider("🌡️ _**Choose temperature at the start of the match (Celsius):**_", -10.68, 33.06, 11.0, key="epl_match_temp")
-            wind_speeds = st.slider("🌀 _**Choose the wind speed at the start of the match (meters/second):**_", 0.95, 20.12, 6.0, key="epl_wind_speeds")
-            humidity_level = st.slider("🌫️ _**Choose the humidity percentage at the start of the match:**_", 20.0, 100.00, 70.0, key="epl_humidity")
-            pressure_amount = st.slider("🥵 _**Choose the atmospheric pressure at the start of the match (millibars):**_", 964.0, 1043.0, 1014.0, key="epl_pressure")
-            cloudiness = st.slider("☁️ _**Choose the percentage of cloud coverage at the start of the match:**_", 0.0, 100.0, 69.0, key="epl_cloudiness")
-            
-            time = st.selectbox("⌛ _**Choose if the match was played earlier in the day (before or at 3:00pm) or later in day (after 3:00pm):**_", time_in_day, key="epl_match_time")
-
-            input_data = {'position_away':away_position, 'position_home':home_position, 'match_temperature':match_temp, 'wind_speed':wind_speeds, 
-                        'humidity':humidity_level, 'pressure':pressure_amount, 'clouds':cloudiness, 'team_name_home':team_home, 'team_name_away':team_away, 'time_of_day':time}
-
-            # Send request to FastAPI
-            # response = requests.post("http://127.0.0.1:8000/predict/matchoutcome/epl", json=input_data)
-            # response = requests.post("http://backend:8000/predict/matchoutcome/epl", json=input_data)
-            # NEW (Render-friendly)
-            response = requests.post("https://backend-qhog.onrender.com/predict/matchoutcome/epl", json=input_data)
-
-            if response.status_code == 200:
-                result = response.json()
-                probability = result['prediction']
-            
-                epl_match_prob_container.markdown(
-                f"<div class='sticky-prob'>⚽ <strong>EPL - Winning Prob for {team_home}:</strong> "
-                f"<span style='color:#EF0107; font-size: 1.5em'>{probability:.2%}</span></div>",
-                unsafe_allow_html=True
-            )
-            else:
-                st.error("Something went wrong")
-                st.write(response.status_code)
-
-        
-        if selection == "La Liga":
-
-            # Sticky container style and empty slot for EPL
-            st.markdown("""
-            <style>
-                .sticky-prob {
-                    position: fixed;
-                    top: 80px;
-                    right: 30px;
-                    width: 280px;
-                    background-color: #063672; /* Updated background */
-                    color: white; /* Text color */
-                    padding: 15px;
-                    border-radius: 12px;
-                    box-shadow: 0 4px 12px rgba(0, 0, 0, 0.4);
-                    z-index: 9999;
-                    text-align: center;
-                    font-family: 'Segoe UI', sans-serif;
-                }
-            </style>
-        """, unsafe_allow_html=True)
-            
-            laliga_match_prob_container = st.empty()
-            image = Image.open('img/laliga.jpg')
-            st.image(image)
-
-            # Load trained model pipeline
-            model = joblib.load("laligamatches5ymodel_rf.pkl")
-
-            st.markdown("###### Adjust the parameters below to see how the features affect the probability of the home team winning.")
-
-            important_features = st.checkbox("_Check this box to see the amout of influence the features have on the model "
-            "(it will not affect the model's prediction if you click here):_", value=False, key="laliga_win_prob_feature_importance")
-
-            if important_features == True:
-                ## Feature Importances
-                numeric_features = ['match_temperature', 'wind_speed',	'humidity',	'pressure',	'clouds']
-                categorical_features = ['team_name_home', 'team_name_away', 'position_away', 'position_home', 'time_of_day']
-
-                importances = model.named_steps['classifier'].feature_importances_
-                feature_names = numeric_features + (model.named_steps['preprocessor'].transformers_[1][1].named_steps['encoder'].get_feature_names_out(categorical_features).tolist())
-                
-                # Clean feature names
-                def clean_name(name):
-                    name = name.lower()
-                    if 'name_' in name:
-                        name = name.replace('name_', '')
-                    return name.replace('_', ' ')
-
-            
-                # Sort by importance
-                sorted_idx = np.argsort(importances)
-                sorted_importances = importances[sorted_idx]
-                sorted_features = [clean_name(feature_names[i]) for i in sorted_idx]
-
-                # Dark mode styling
-                plt.style.use('dark_background')
-                fig, ax = plt.subplots(figsize=(10, len(sorted_features) * 0.3))
-                ax.set_facecolor('#063672')  
-                fig.patch.set_facecolor('#063672')
-
-                # Draw lollipop chart
-                ax.hlines(y=sorted_features, xmin=0, xmax=sorted_importances, color='#444', linewidth=1)
-                ax.plot(sorted_importances, sorted_features, "o", markersize=10, color='#EF0107') 
-
-                # Axes and labels
-                ax.set_xlabel("Feature Importance", fontsize=12, color='white')
-                ax.set_title("Feature Importances", fontsize=14, color='white', weight='bold')
-                ax.tick_params(colors='white', labelsize=10)
-                ax.grid(axis='x', linestyle='--', alpha=0.3, color='white')
-                fig.tight_layout()
-
-                # Streamlit:
-                st.pyplot(fig)
-
-            home_team = ['FC Barcelona', 'Almería', 'Athletic Club', 'Atlético Madrid', 'Cádiz', 'Celta de Vigo',
-                 'Deportivo Alavés', 'Elche', 'Espanyol', 'Getafe',
-                 'Girona', 'Granada', 'Las Palmas', 'Leganés', 'Mallorca', 'Osasuna',
-                 'Rayo Vallecano', 'Real Betis', 'Real Madrid', 'Real Sociedad',
-                 'Real Valladolid', 'Sevilla', 'Valencia', 'Villarreal']
-
-            time_in_day = ['earlier', 'later']
-            
-            # Streamlit widgets
-            
-            team_home = st.selectbox("⬜ _**Choose a home_team**_", home_team, key= "laliga_home_team")
-            for team_name in home_team:
-                if team_home == team_name:
-                    image_laliga_team = Image.open(f'img_laliga/{team_name}.jpg')
-                    st.image(image_laliga_team)
-
-            team_away_list = [team for team in home_team if team != team_home]
-            team_away = st.selectbox("🟥 _**Choose an away team**_", team_away_list, key= "laliga_away_team")
-            for team_name in team_away_list:
-                if team_name == team_away:
-                    image_laliga_team = Image.open(f'img_laliga/{team_name}.jpg')
-                    st.image(image_laliga_team)
-
-
-            home_position = st.selectbox("⬜ _**Choose the home team's current standing on the table:**_", np.arange(1,21,1).astype(float), key="laliga_home_position")
-            away_position_list = [float(i) for i in range(1,21) if i != home_position] 
-            away_position = st.selectbox("🟥 _**Choose the away team's current standing on the table:**_", away_position_list, key="laliga_away_position")
-
-            match_temp = st.slider("🌡️ _**Choose temperature at the start of the match (Celsius):**_", -0.81, 36.86, 18.0, key="laliga_match_temp")
-            wind_speeds = st.slider("🌀 _**Choose the wind speed at the start of the match (meters/second):**_", 0.71, 18.05, 5.0, key="laliga_wind_speeds")
-            humidity_level = st.slider("🌫️ _**Choose the humidity percentage at the start of the match:**_", 14.0, 100.00, 58.0, key="laliga_humidity")
-            pressure_amount = st.slider("🥵 _**Choose the atmospheric pressure at the start of the match (millibars):**_", 983.0, 1046.0, 1017.0, key="laliga_pressure")
-            cloudiness = st.slider("☁️ _**Choose the percentage of cloud coverage at the start of the match:**_", 0.0, 100.0, 53.0, key="laliga_cloudiness")
-            
-            time = st.selectbox("⌛ _**Choose if the match was played earlier in the day (before or at 5:00pm) or later in day (after 5:00pm):**_", time_in_day, key="laliga_match_time")
-
-            input_data = {'position_away':away_position, 'position_home':home_position, 'match_temperature':match_temp, 'wind_speed':wind_speeds, 
-                        'humidity':humidity_level, 'pressure':pressure_amount, 'clouds':cloudiness, 'team_name_home':team_home, 'team_name_away':team_away, 'time_of_day':time}
-
-            # Send request to FastAPI
-            # response = requests.post("http://127.0.0.1:8000/predict/matchoutcome/epl", json=input_data)
-            # response = requests.post("http://backend:8000/predict/matchoutcome/epl", json=input_data)
-            # NEW (Render-friendly)
-            response = requests.post("https://backend-qhog.onrender.com/predict/matchoutcome/laliga", json=input_data)
-
-            if response.status_code == 200:
-                result = response.json()
-                probability = result['prediction']
-                # st.markdown(f"### 🎯 Probability of Winning: <span style='color:red'>{probability:.2%}</span>", unsafe_allow_html=True)
-            
-                laliga_match_prob_container.markdown(
-                f"<div class='sticky-prob'>⚽ <strong>EPL - Winning Prob for {team_home}:</strong> "
-                f"<span style='color:#EF0107; font-size: 1.5em'>{probability:.2%}</span></div>",
-                unsafe_allow_html=True
-            )
-            else:
-                st.error("Something went wrong")
-                st.write(response.status_code)
+        match_outcome(selection, registry[selection])
 
 if page == "References":
     doc_page = st.sidebar.radio("**Go to**", ["GitHub", "SportMonks", "Statsbomb"])
@@ -839,9 +561,7 @@ if page == "About me":
         "professionals seeking deeper strategic insights. Whether you're a club, coach, or just a football fanatic, my goal is to " \
         "turn raw numbers into smarter play and more wins. Let's connect on LinkedIn and talk football, data, or who is going to win the World Cup.")
 
-        image_bio = Image.open('img/bio.jpg')
-        image_bio = ImageOps.exif_transpose(image_bio)  # 💡 Fix orientation based on EXIF
-        st.image(image_bio)
+        show_image('img/bio.jpg')  # 💡 Orientation is fixed from EXIF at build time
 
     elif site_page == "LinkedIn":
         st.sidebar.markdown(
@@ -0,0 +1,44 @@
+# assets.py
+#
+# Crests, banners and screenshots built by build_assets.py. The manifest is read
+# once per process into a map of original path -> content-hashed static URL.
+# Images are then sent as plain <img> tags pointing at Streamlit's static file
+# server: no PIL decode or re-encode per rerun. The ?v=<hash> query makes Tornado
+# send a long Cache-Control max-age, which is safe because the name changes with
+# the content.
+#
+# If the manifest is missing (build step not run locally) we fall back to st.image.
+
+import json
+import os
+from urllib.parse import quote
+
+import streamlit as st
+from PIL import Image, ImageOps
+
+
+MANIFEST = os.path.join("static", "assets", "manifest.json")
+STATIC_URL = "app/static/assets"
+
+
+@st.cache_resource
+def asset_map():
+    if not os.path.exists(MANIFEST):
+        return {}
+    with open(MANIFEST, encoding="utf-8") as f:
+        manifest = json.load(f)
+    return {
+        path: (f"{STATIC_URL}/{quote(entry['file'])}?v={entry['hash']}", entry["width"])
+        for path, entry in manifest.items()
+    }
+
+
+# Drop-in replacement for st.image(Image.open(path))
+def show_image(path):
+    asset = asset_map().get(path)
+    if asset is None:
+        st.image(ImageOps.exif_transpose(Image.open(path)))
+        return
+    url, width = asset
+    st.markdown(f'<img src="{url}" style="width:100%; max-width:{width}px; margin-bottom:1rem">',
+                unsafe_allow_html=True)
@@ -0,0 +1,85 @@
+# build_assets.py
+#
+# Build-time image step for the Streamlit app. Run from frontend/ (the Dockerfile does):
+#
+#   python build_assets.py
+#
+# Every crest, banner and screenshot under img/ and each league's crest directory is
+# resized to the display width of its asset class (MAX_WIDTHS), re-encoded as
+# WebP and written to static/assets/ under a content-hashed name.
+# static/assets/manifest.json maps each original path (e.g. "img_epl/Arsenal.jpg")
+# to its built file, which assets.py loads.
+
+import hashlib
+import io
+import json
+import os
+
+from PIL import Image, ImageOps
+
+import leagues
+
+
+# img/ plus the crest directory of every league in the registry (leagues.py)
+CREST_DIRS = leagues.crest_dirs()
+SOURCE_DIRS = ["img"] + CREST_DIRS
+OUT_DIR = os.path.join("static", "assets")
+MANIFEST = os.path.join(OUT_DIR, "manifest.json")
+
+# Widest built image per asset class, 2x the display width for high-DPI screens:
+# banners, pitch images and screenshots span the ~700px centered layout, crests
+# are shown as small badges
+MAX_WIDTHS = {"crest": 400, "image": 1400}
+PHOTO_QUALITY = 80
+# Screenshots contain text, so compress them less
+SCREENSHOT_QUALITY = 90
+
+
+def asset_class(source_dir):
+    return "crest" if source_dir in CREST_DIRS else "image"
+
+
+def build_image(src_path, max_width):
+    image = ImageOps.exif_transpose(Image.open(src_path))
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+    if image.width > max_width:
+        height = round(image.height * max_width / image.width)
+        image = image.resize((max_width, height), Image.LANCZOS)
+
+    quality = SCREENSHOT_QUALITY if src_path.lower().endswith(".png") else PHOTO_QUALITY
+    buffer = io.BytesIO()
+    image.save(buffer, format="WEBP", quality=quality, method=6)
+    return buffer.getvalue(), image.size
+
+
+def main():
+    os.makedirs(OUT_DIR, exist_ok=True)
+    manifest = {}
+    source_bytes = built_bytes = 0
+
+    for source_dir in SOURCE_DIRS:
+        max_width = MAX_WIDTHS[asset_class(source_dir)]
+        for filename in sorted(os.listdir(source_dir)):
+            src_path = f"{source_dir}/{filename}"
+            if not filename.lower().endswith((".jpg", ".jpeg", ".png", ".webp")):
+                continue
+            data, (width, height) = build_image(src_path, max_width)
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            stem = os.path.splitext(filename)[0]
+            out_name = f"{source_dir}/{stem}.{digest}.webp"
+            os.makedirs(os.path.join(OUT_DIR, source_dir), exist_ok=True)
+            with open(os.path.join(OUT_DIR, out_name), "wb") as f:
+                f.write(data)
+
+            manifest[src_path] = {"file": out_name, "hash": digest, "width": width, "height": height}
+            source_bytes += os.path.getsize(src_path)
+            built_bytes += len(data)
+
+    with open(MANIFEST, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    print(f"Built {len(manifest)} images: {source_bytes / 1e6:.1f} MB -> {built_bytes / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
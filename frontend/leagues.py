@@ -0,0 +1,36 @@
+# leagues.py
+#
+# League registry shared with the backend: data-backend/leagues.json, copied
+# next to app.py by the Dockerfile. Each league's match outcome tool (team
+# lists, crests, banner, slider ranges, kickoff cutoff, backend route) and the
+# crest directories build_assets.py converts all come from this file, so adding
+# a league needs no new code here.
+
+import functools
+import json
+import os
+
+
+LEAGUES_CONFIG = os.getenv("LEAGUES_CONFIG", "leagues.json" if os.path.exists("leagues.json") else os.path.join("..", "data-backend", "leagues.json"))
+
+
+@functools.lru_cache(maxsize=None)
+def registry():
+    with open(LEAGUES_CONFIG, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def crest_dirs():
+    return [league["crest_dir"] for league in registry().values() if league.get("crest_dir") and os.path.isdir(league["crest_dir"])]
+
+
+# Crest image of a team, or None when the league has none for it yet
+def crest_path(league, team):
+    path = f"{league['crest_dir']}/{team}.jpg" if league.get("crest_dir") else None
+    return path if path and os.path.exists(path) else None
+
+
+# "15:00" -> "3:00pm", as the match outcome tool words the time_of_day cutoff
+def cutoff_label(league):
+    hour, minute = (int(part) for part in league.get("kickoff_cutoff", "15:00").split(":"))
+    return f"{hour % 12 or 12}:{minute:02d}{'am' if hour < 12 else 'pm'}"
@@ -0,0 +1,83 @@
+# pitch.py
+#
+# Plotly pitch for the goal prediction tools. The static part of the figure (pitch
+# lines, boxes, centre circle, layout) is built and serialized once per process,
+# turned into a go.Figure once per session, and each rerun only moves the
+# player marker of that Figure.
+
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+
+# Centre circle resolution; the circle is 10 units wide on a 120x80 pitch, so 64 points is plenty
+CIRCLE_POINTS = 64
+
+
+@st.cache_resource
+def base_pitch():
+    fig = go.Figure()
+
+    # Player position placeholder, always trace 0
+    fig.add_trace(go.Scatter(
+        x=[0],
+        y=[0],
+        mode='markers',
+        marker=dict(size=14, color='red'),
+        name='Player Position',
+        showlegend=False
+    ))
+
+    # Draw pitch lines manually
+    pitch_shapes = [
+        # Outer boundaries and center line
+        dict(type="rect", x0=0, y0=0, x1=120, y1=80, line=dict(color="white", width=3)),
+        dict(type="line", x0=60, y0=0, x1=60, y1=80, line=dict(color="white", width=3)),
+        # Penalty areas
+        dict(type="rect", x0=0, y0=18, x1=18, y1=62, line=dict(color="white")),
+        dict(type="rect", x0=102, y0=18, x1=120, y1=62, line=dict(color="white")),
+        # 6-yard boxes
+        dict(type="rect", x0=0, y0=30, x1=6, y1=50, line=dict(color="white")),
+        dict(type="rect", x0=114, y0=30, x1=120, y1=50, line=dict(color="white")),
+    ]
+
+    # Center circle, closed and rounded to keep the serialized payload small
+    theta = np.linspace(0, 2 * np.pi, CIRCLE_POINTS + 1)
+    circle_x = np.round(60 + 10 * np.cos(theta), 2)
+    circle_y = np.round(40 + 10 * np.sin(theta), 2)
+    fig.add_trace(go.Scatter(x=circle_x, y=circle_y, mode='lines', line=dict(color='white'), showlegend=False))
+
+    fig.update_layout(
+        title="🔴 Player Position",
+        shapes=pitch_shapes,
+        xaxis=dict(
+            range=[0, 120],
+            showgrid=False,
+            zeroline=False,
+            constrain='domain'  # ✨ Prevents excess padding on the x-axis
+        ),
+        yaxis=dict(
+            range=[0, 80],
+            showgrid=False,
+            zeroline=False,
+            scaleanchor="x",
+            scaleratio=1
+        ),
+        height=430,
+        margin=dict(l=0, r=0, t=40, b=0),  # ✨ Tighter margins
+        plot_bgcolor='#1f4722'
+    )
+
+    # Serialized once; callers must treat it as read-only
+    return fig.to_dict()
+
+
+# Pitch with the player marker at (x, y). st.plotly_chart validates a dict into
+# a new go.Figure on every call, so each session keeps one Figure, built from the
+# cached base the first time, and only the marker coordinates are set per rerun.
+def pitch_figure(x, y, key):
+    fig = st.session_state.get(key)
+    if fig is None:
+        fig = st.session_state[key] = go.Figure(base_pitch())
+    fig.data[0].update(x=[x], y=[y])
+    return fig